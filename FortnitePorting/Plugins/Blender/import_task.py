@@ -2,15 +2,42 @@ import bpy
 import os
 import json
 import re
-import bmesh
 import traceback
+import numpy as np
 from enum import Enum
-from math import radians
+from math import radians, pi
+from operator import itemgetter
 from mathutils import Matrix, Vector, Euler, Quaternion
-from .ue_format import UEFormatImport, UEModelOptions, UEAnimOptions
 from .logger import Log
 from .server import MessageServer
 
+OUTLINE_MATERIAL_PATTERN = re.compile("Outline|Toon_Lines")
+DUPLICATE_SUFFIX_PATTERN = re.compile(r"\.\d{3}$")
+OVERRIDE_MESH_TYPES = frozenset({"Outfit", "Backpack"})
+WORLD_TYPES = frozenset({"World", "Prefab"})
+VERTEX_CRUNCH_MATERIALS = frozenset({"MI_VertexCrunch", "M_VertexCrunch"})
+MERGED_SOCKETS = frozenset({"Face", "Helmet", None})
+
+# pack color dicts into socket tuples in a single call
+get_rgb = itemgetter("R", "G", "B")
+get_rgba = itemgetter("R", "G", "B", "A")
+
+# tuples rather than sets, get_param_multiple returns the first name present
+LAYER_SWITCH_NAMES = ("Use 2 Layers", "Use 3 Layers", "Use 4 Layers", "Use 5 Layers", "Use 6 Layers", "Use 7 Layers",
+                      "Use 2 Materials", "Use 3 Materials", "Use 4 Materials", "Use 5 Materials", "Use 6 Materials", "Use 7 Materials",
+                      "Use_Multiple_Material_Textures")
+EXTRA_LAYER_NAMES = ("Diffuse_Texture_2", "SpecularMasks_2", "Normals_Texture_2", "Emissive_Texture_2",
+                     "Diffuse_Texture_3", "SpecularMasks_3", "Normals_Texture_3", "Emissive_Texture_3",
+                     "Diffuse_Texture_4", "SpecularMasks_4", "Normals_Texture_4", "Emissive_Texture_4",
+                     "Diffuse_Texture_5", "SpecularMasks_5", "Normals_Texture_5", "Emissive_Texture_5",
+                     "Diffuse_Texture_6", "SpecularMasks_6", "Normals_Texture_6", "Emissive_Texture_6")
+EMISSIVE_TOGGLE_NAMES = ("Emissive", "UseBasicEmissive", "UseAdvancedEmissive", "Use Emissive")
+EMISSION_CROP_VECTOR_NAMES = ("EmissiveUVs_RG_UpperLeftCorner_BA_LowerRightCorner",
+                              "Emissive Texture UVs RG_TopLeft BA_BottomRight",
+                              "Emissive 2 UV Positioning (RG)UpperLeft (BA)LowerRight",
+                              "EmissiveUVPositioning (RG)UpperLeft (BA)LowerRight")
+EMISSION_CROP_SWITCH_NAMES = ("CroppedEmissive", "Manipulate Emissive Uvs")
+
 class ERigType(Enum):
     DEFAULT = 0
     TASTY = 1
@@ -19,7 +46,15 @@ class ETextureExportTypes(Enum):
     DATA = 0
     PLANE = 1
 
+def index_mappings(mappings):
+    # keep the first mapping for a name to match the old linear search
+    return {mapping.name: mapping for mapping in reversed(mappings)}
+
+
 class MappingCollection:
+    __slots__ = ("textures", "scalars", "vectors", "switches", "component_masks",
+                 "textures_by_name", "scalars_by_name", "vectors_by_name", "switches_by_name", "component_masks_by_name")
+
     def __init__(self, textures=(), scalars=(), vectors=(), switches=(), component_masks=()):
         self.textures = textures
         self.scalars = scalars
@@ -27,8 +62,16 @@ class MappingCollection:
         self.switches = switches
         self.component_masks = component_masks
 
+        self.textures_by_name = index_mappings(textures)
+        self.scalars_by_name = index_mappings(scalars)
+        self.vectors_by_name = index_mappings(vectors)
+        self.switches_by_name = index_mappings(switches)
+        self.component_masks_by_name = index_mappings(component_masks)
+
 
 class SlotMapping:
+    __slots__ = ("name", "slot", "alpha_slot", "switch_slot", "value_func", "coords", "allow_switch")
+
     def __init__(self, name, slot=None, alpha_slot=None, switch_slot=None, value_func=None, coords="UV0", allow_switch=None):
         self.name = name
         self.slot = name if slot is None else slot
@@ -286,6 +329,16 @@ gradient_mappings = MappingCollection(
     ]
 )
 
+shader_mappings = {
+    "FP Material": default_mappings,
+    "FP Layer": layer_mappings,
+    "FP Toon": toon_mappings,
+    "FP Valet": valet_mappings,
+    "FP Glass": glass_mappings,
+    "FP Foliage": foliage_mappings,
+    "FP Gradient": gradient_mappings,
+}
+
 class ImportTask:
     def run(self, response):
         assets_folder = response.get("AssetsFolder")
@@ -300,21 +353,29 @@ class ImportTask:
 class DataImportTask:
     def __init__(self, data, assets_folder, options):
         self.imported_materials = {}
+        self.image_cache = {}
         self.assets_folder = assets_folder
+        self.assets_folder_prefix = os.path.join(assets_folder, "")
+        self.path_exists_cache = {}
         self.options = options
+        self.scale_factor = 0.01 if options.get("ScaleDown") else 1
         self.import_data(data)
 
     def import_data(self, data):
-        print(json.dumps(data))
         self.name = data.get("Name")
         self.type = data.get("Type")
+        Log.info(f"Importing {self.type}: {self.name}")
+        if self.options.get("Debug"):
+            Log.info(json.dumps(data, separators=(",", ":")))
         self.override_materials = []
         self.override_parameters = []
+        self.override_parameters_by_material = {}
         self.is_toon = False
         self.collection = bpy.context.scene.collection
         self.meshes = []
         self.imported_mesh_count = 0
         self.imported_meshes = []
+        self.actor_transforms = {}
         self.crunch_verts_materials = []
         self.rig_type = ERigType(self.options.get("RigType"))
 
@@ -334,16 +395,22 @@ class DataImportTask:
     def import_mesh_data(self, data):
         self.override_materials = data.get("OverrideMaterials")
         self.override_parameters = data.get("OverrideParameters")
+        for override_parameter in self.override_parameters or []:
+            self.override_parameters_by_material.setdefault(override_parameter.get("MaterialNameToAlter"), []).append(override_parameter)
         self.collection = create_collection(self.name) if self.options.get("ImportCollection") else bpy.context.scene.collection
 
         meshes = data.get("Meshes")
-        if self.type in ["Outfit", "Backpack"]:
+        if self.type in OVERRIDE_MESH_TYPES:
             meshes = data.get("OverrideMeshes")
+            present_types = {override_mesh.get("Type") for override_mesh in meshes}
             for mesh in data.get("Meshes"):
-                if not any(meshes, lambda override_mesh: override_mesh.get("Type") == mesh.get("Type")):
+                if (mesh_type := mesh.get("Type")) not in present_types:
+                    present_types.add(mesh_type)
                     meshes.append(mesh)
 
         self.meshes = meshes
+        if self.type in WORLD_TYPES:
+            self.actor_transforms = dict(zip(map(id, meshes), make_transforms(meshes)))
         for mesh in meshes:
             self.import_model(mesh, collection=self.collection, allow_3d_cursor_spawn=True)
 
@@ -386,7 +453,7 @@ class DataImportTask:
                 
             for crunch_verts_material in self.crunch_verts_materials:
                 geo_nodes = master_mesh.modifiers.new("Crunch Verts", "NODES")
-                geo_nodes.node_group = bpy.data.node_groups.get("FP Crunch Verts")
+                geo_nodes.node_group = get_node_group("FP Crunch Verts")
                 geo_nodes["Socket_3"] = crunch_verts_material
 
             if self.is_toon:
@@ -426,10 +493,10 @@ class DataImportTask:
 
         # clear old data
         target_skeleton.animation_data_clear()
-        if bpy.context.scene.sequence_editor:
-            sequences_to_remove = where(bpy.context.scene.sequence_editor.sequences, lambda seq: seq.get("FPSound"))
-            for sequence in sequences_to_remove:
-                bpy.context.scene.sequence_editor.sequences.remove(sequence)
+        if sequence_editor := bpy.context.scene.sequence_editor:
+            sequences = sequence_editor.sequences
+            for sequence in [sequence for sequence in sequences if sequence.get("FPSound")]:
+                sequences.remove(sequence)
 
         # start import
         target_skeleton.animation_data_create()
@@ -499,9 +566,9 @@ class DataImportTask:
             for prop in props:
                 mesh = self.import_model(prop.get("Mesh"))
                 constraint_object(mesh, master_skeleton, prop.get("SocketName"), [0, 0, 0])
-                mesh.rotation_euler = make_euler(prop.get("RotationOffset"))
-                mesh.location = make_vector(prop.get("LocationOffset"), mirror_y=True) * 0.01
-                mesh.scale = make_vector(prop.get("Scale"))
+                mesh.matrix_basis = Matrix.LocRotScale(make_vector(prop.get("LocationOffset"), mirror_y=True) * 0.01,
+                                                       make_euler(prop.get("RotationOffset")),
+                                                       make_vector(prop.get("Scale")))
 
                 if (anims := prop.get("AnimSections")) and len(anims) > 0:
                     mesh.animation_data_create()
@@ -538,6 +605,18 @@ class DataImportTask:
             self.import_sound(path, time_to_frame(sound.get("Time")))
         
 
+    def apply_transform(self, imported_object, mesh):
+        if transform := self.actor_transforms.get(id(mesh)):
+            location, rotation, scale = transform
+        else:
+            location = make_vector(mesh.get("Location"), mirror_y=True) * 0.01
+            rotation = make_euler(mesh.get("Rotation"))
+            scale = make_vector(mesh.get("Scale"))
+
+        imported_object.rotation_euler = rotation
+        imported_object.location = location
+        imported_object.scale = scale
+
     def import_model(self, mesh, collection=None, parent=None, allow_3d_cursor_spawn=False):
         mesh_type = mesh.get("Type")
         mesh_path = mesh.get("Path")
@@ -548,31 +627,27 @@ class DataImportTask:
         if mesh.get("IsEmpty"):
             imported_object = bpy.data.objects.new(object_name, None)
             
-            imported_object.rotation_euler = make_euler(mesh.get("Rotation"))
-            imported_object.location = make_vector(mesh.get("Location"), mirror_y=True) * 0.01
-            imported_object.scale = make_vector(mesh.get("Scale"))
+            self.apply_transform(imported_object, mesh)
             collection.objects.link(imported_object)
             for child in mesh.get("Children"):
                 self.import_model(child, collection, imported_object)
             return
         
-        if self.type in ["World", "Prefab"] and (existing_mesh_data := bpy.data.meshes.get(mesh_path.split(".")[1])):
+        if self.type in WORLD_TYPES and (existing_mesh_data := bpy.data.meshes.get(mesh_path.split(".")[1])):
             imported_object = bpy.data.objects.new(object_name, existing_mesh_data)
             collection.objects.link(imported_object)
         else:
             imported_object = self.import_mesh(mesh.get("Path"), mesh.get("NumLods"))
             imported_object.name = object_name
 
-        if self.type in ["World", "Prefab"]:
+        if self.type in WORLD_TYPES:
             self.imported_mesh_count += 1
             Log.info(f"Actor {self.imported_mesh_count}/{len(self.meshes)}: {object_name}")
 
         if parent:
             imported_object.parent = parent
 
-        imported_object.rotation_euler = make_euler(mesh.get("Rotation"))
-        imported_object.location = make_vector(mesh.get("Location"), mirror_y=True) * 0.01
-        imported_object.scale = make_vector(mesh.get("Scale"))
+        self.apply_transform(imported_object, mesh)
 
         if allow_3d_cursor_spawn and self.options.get("SpawnAt3DCursor"):
             imported_object.location += bpy.context.scene.cursor.location
@@ -593,8 +668,8 @@ class DataImportTask:
                     continue
                     
                 for search_prop in search_props:
-                    if found_key := first(meta.keys(), lambda key: key == search_prop):
-                        out_props[found_key] = meta.get(found_key)
+                    if search_prop in meta:
+                        out_props[search_prop] = meta[search_prop]
             return out_props
 
         # fetch metadata
@@ -605,9 +680,9 @@ class DataImportTask:
                 meta = get_meta(["MorphNames", "HatType"])
                 shape_keys = imported_mesh.data.shape_keys
                 if (morph_name := meta.get("MorphNames").get(meta.get("HatType"))) and shape_keys is not None:
-                    for key in shape_keys.key_blocks:
-                        if key.name.casefold() == morph_name.casefold():
-                            key.value = 1.0
+                    key_blocks_by_name = {key.name.casefold(): key for key in shape_keys.key_blocks}
+                    if key := key_blocks_by_name.get(morph_name.casefold()):
+                        key.value = 1.0
             case _:
                 meta = {}
 
@@ -641,7 +716,7 @@ class DataImportTask:
                 # NOTE: I think faceAttach affects the expected location
                 # I'm making this assumption from observation of an old
                 # export of face poses for Polar Patroller.
-                loc_scale = (0.01 if self.options.get("ScaleDown") else 1)
+                loc_scale = self.scale_factor
                 for pose in pose_data:
                     # If there are no influences, don't bother
                     if not (influences := pose.get('Keys')):
@@ -734,16 +809,16 @@ class DataImportTask:
                 bpy.ops.pose.select_all(action='DESELECT')
                 bpy.ops.object.mode_set(mode=original_mode)
 
-        if self.options.get("UseQuads"):
+        if self.options.get("UseQuads") and has_triangles(imported_mesh.data):
             bpy.context.view_layer.objects.active = imported_mesh
             bpy.ops.object.mode_set(mode='EDIT')
             bpy.ops.mesh.tris_convert_to_quads(uvs=True)
             bpy.ops.object.mode_set(mode='OBJECT')
 
         meta["TextureData"] = mesh.get("TextureData")
-        meta["OverrideParameters"] = self.override_parameters
 
         # import mats
+        outline_indices = []
         for material in mesh.get("Materials"):
             index = material.get("Slot")
             if index >= len(imported_mesh.material_slots):
@@ -752,30 +827,29 @@ class DataImportTask:
             self.import_material(imported_mesh.material_slots[index], material, meta)
             
             material_name = material.get("Name")
-            if any(["Outline", "Toon_Lines"], lambda x: x in material_name):
-                bm = bmesh.new()
-                bm.from_mesh(imported_mesh.data)
-                bmesh.ops.delete(bm, geom=[f for f in bm.faces if f.material_index == index], context='FACES')
-                bm.to_mesh(imported_mesh.data)
-                bm.free()
+            if OUTLINE_MATERIAL_PATTERN.search(material_name):
+                outline_indices.append(index)
+
+        if outline_indices:
+            remove_faces_by_material(imported_mesh.data, outline_indices)
 
+        slots_by_name = get_slots_by_name(imported_mesh.material_slots)
         for override_material in mesh.get("OverrideMaterials"):
             index = override_material.get("Slot")
             if index >= len(imported_mesh.material_slots):
                 continue
 
+            # importing can rename a slot, move it to its new name so later entries see it
             overridden_material = imported_mesh.material_slots[index]
-            slots = where(imported_mesh.material_slots,
-                          lambda slot: slot.name.casefold() == overridden_material.name.casefold())
-            for slot in slots:
+            for slot in slots_by_name.pop(overridden_material.name.casefold(), []):
                 self.import_material(slot, override_material, meta)
+                slots_by_name.setdefault(slot.name.casefold(), []).append(slot)
 
         for variant_override_material in self.override_materials:
             material_name_to_swap = variant_override_material.get("MaterialNameToSwap")
-            slots = where(imported_mesh.material_slots,
-                          lambda slot: slot.name.casefold() == material_name_to_swap.casefold())
-            for slot in slots:
+            for slot in slots_by_name.pop(material_name_to_swap.casefold(), []):
                 self.import_material(slot, variant_override_material, meta)
+                slots_by_name.setdefault(slot.name.casefold(), []).append(slot)
             
         if imported_mesh:
             for slot in imported_mesh.material_slots:
@@ -790,41 +864,41 @@ class DataImportTask:
         return imported_object
             
     def import_material(self, material_slot, material_data, meta_data):
-        temp_material = material_slot.material
-        material_slot.link = 'OBJECT'
-        material_slot.material = temp_material
-        
         material_name = material_data.get("Name")
         material_hash = material_data.get("Hash")
-        additional_hash = 0
 
         texture_data = meta_data.get("TextureData")
-        if texture_data:
-            for data in texture_data:
-                additional_hash += data.get("Hash")
+        override_parameters = self.override_parameters_by_material.get(material_name, [])
 
-        override_parameters = where(meta_data.get("OverrideParameters"),
-                                    lambda param: param.get("MaterialNameToAlter") == material_name)
-        if override_parameters:
-            for parameters in override_parameters:
-                additional_hash += parameters.get("Hash")
+        # summing the hashes lets different combinations collide, key on every hash instead
+        texture_hashes = tuple(sorted(data.get("Hash") for data in texture_data)) if texture_data else ()
+        parameter_hashes = tuple(sorted(parameters.get("Hash") for parameters in override_parameters))
+        material_key = (material_hash, texture_hashes, parameter_hashes)
+
+        # check the cache before touching the slot, a hit only needs the object link
+        if existing := self.imported_materials.get(material_key):
+            material_slot.link = 'OBJECT'
+            material_slot.material = existing
+            return
+
+        temp_material = material_slot.material
+        material_slot.link = 'OBJECT'
+        material_slot.material = temp_material
 
+        # names keep the summed hash so variants stay stable across sessions and python versions
+        additional_hash = sum(texture_hashes) + sum(parameter_hashes)
+        name_hash = material_hash + additional_hash
         if additional_hash != 0:
-            material_hash += additional_hash
-            material_name += f"_{hash_code(material_hash)}"
+            material_name += f"_{hash_code(name_hash)}"
 
         # same name but diff hash
-        if (name_existing := first(self.imported_materials.items(), lambda x: x[1].name.casefold() == material_name.casefold())) and name_existing[0] != material_hash:
-            material_name += f"_{hash_code(material_hash)}"
-
-        if existing := self.imported_materials.get(material_hash):
-            material_slot.material = existing
-            return
+        if (name_existing := first(self.imported_materials.items(), lambda x: x[1].name.casefold() == material_name.casefold())) and name_existing[0] != material_key:
+            material_name += f"_{hash_code(name_hash)}"
 
         if material_slot.material.name.casefold() != material_name.casefold():
             material_slot.material = bpy.data.materials.new(material_name)
 
-        self.imported_materials[material_hash] = material_slot.material
+        self.imported_materials[material_key] = material_slot.material
         material = material_slot.material
         material.use_nodes = True
         material.blend_method = "CLIP"
@@ -834,6 +908,10 @@ class DataImportTask:
         links = material.node_tree.links
         links.clear()
 
+        # bound once, these are hit for every parameter
+        new_node = nodes.new
+        new_link = links.new
+
         textures = material_data.get("Textures")
         scalars = material_data.get("Scalars")
         vectors = material_data.get("Vectors")
@@ -857,54 +935,62 @@ class DataImportTask:
                 for vector in override_parameter.get("Vectors"):
                     replace_or_add_parameter(vectors, vector)
 
-        output_node = nodes.new(type="ShaderNodeOutputMaterial")
+        textures_by_name = index_parameters(textures)
+        scalars_by_name = index_parameters(scalars)
+        vectors_by_name = index_parameters(vectors)
+        switches_by_name = index_parameters(switches)
+
+        output_node = new_node(type="ShaderNodeOutputMaterial")
         output_node.location = (200, 0)
 
-        shader_node = nodes.new(type="ShaderNodeGroup")
-        shader_node.node_tree = bpy.data.node_groups.get("FP Material")
+        shader_node = new_node(type="ShaderNodeGroup")
+        shader_node.node_tree = get_node_group("FP Material")
 
         def replace_shader_node(name):
-            nonlocal shader_node
+            nonlocal shader_node, socket_mappings
             nodes.remove(shader_node)
-            shader_node = nodes.new(type="ShaderNodeGroup")
-            shader_node.node_tree = bpy.data.node_groups.get(name)
+            shader_node = new_node(type="ShaderNodeGroup")
+            shader_node.node_tree = get_node_group(name)
+            socket_mappings = shader_mappings.get(name, default_mappings)
 
 
         # parameters
         unused_parameter_offset = 0
         socket_mappings = default_mappings
 
+        def report_param_error(data, e):
+            # formatting a full traceback per failed parameter is slow, only do it with the debug logging option
+            Log.warn(f"Failed to set parameter {data.get('Name')} on {material_name}: {e}")
+            if self.options.get("Debug"):
+                traceback.print_exc()
+
         def get_param(source, name):
-            found = first(source, lambda param: param.get("Name") == name)
+            found = source.get(name)
             if found is None:
                 return None
             return found.get("Value")
 
         def get_param_multiple(source, names):
-            found = first(source, lambda param: param.get("Name") in names)
+            found = next(filter(source.__contains__, names), None)
             if found is None:
                 return None
-            return found.get("Value")
+            return source[found].get("Value")
 
         def get_param_data(source, name):
-            found = first(source, lambda param: param.get("Name") == name)
-            if found is None:
-                return None
-            return found
+            return source.get(name)
 
         def texture_param(data, target_mappings, target_node = shader_node, add_unused_params = False):
             try:
                 name = data.get("Name")
                 path = data.get("Value")
 
-                node = nodes.new(type="ShaderNodeTexImage")
+                node = new_node(type="ShaderNodeTexImage")
                 node.image = self.import_image(path)
-                node.image.alpha_mode = 'CHANNEL_PACKED'
-                node.image.colorspace_settings.name = "sRGB" if data.get("sRGB") else "Non-Color"
+                setup_image(node.image, data.get("sRGB"))
                 node.interpolation = "Smart"
                 node.hide = True
 
-                mappings = first(target_mappings.textures, lambda x: x.name == name)
+                mappings = target_mappings.textures_by_name.get(name)
                 if mappings is None:
                     if add_unused_params:
                         nonlocal unused_parameter_offset
@@ -913,35 +999,37 @@ class DataImportTask:
                         unused_parameter_offset -= 50
                     return
                 
-                if mappings.allow_switch and not get_param(switches, mappings.allow_switch):
+                if mappings.allow_switch and not get_param(switches_by_name, mappings.allow_switch):
                     return
 
-                x, y = get_socket_pos(target_node, target_node.inputs.find(mappings.slot))
+                slot = mappings.slot
+                inputs = target_node.inputs
+                x, y = get_socket_pos(target_node, find_socket_index(target_node, slot))
                 node.location = x - 300, y
-                links.new(node.outputs[0], target_node.inputs[mappings.slot])
+                new_link(node.outputs[0], inputs[slot])
 
-                if mappings.alpha_slot:
-                    links.new(node.outputs[1], target_node.inputs[mappings.alpha_slot])
-                if mappings.switch_slot:
-                    target_node.inputs[mappings.switch_slot].default_value = 1 if value else 0
+                if alpha_slot := mappings.alpha_slot:
+                    new_link(node.outputs[1], inputs[alpha_slot])
+                if switch_slot := mappings.switch_slot:
+                    inputs[switch_slot].default_value = 1 if value else 0
                 if mappings.coords != "UV0":
-                    uv = nodes.new(type="ShaderNodeUVMap")
+                    uv = new_node(type="ShaderNodeUVMap")
                     uv.location = node.location.x - 250, node.location.y
                     uv.uv_map = mappings.coords
-                    links.new(uv.outputs[0], node.inputs[0])
+                    new_link(uv.outputs[0], node.inputs[0])
             except Exception as e:
-                traceback.print_exc()
+                report_param_error(data, e)
 
         def scalar_param(data, target_mappings, target_node = shader_node, add_unused_params = False):
             try:
                 name = data.get("Name")
                 value = data.get("Value")
                 
-                mappings = first(target_mappings.scalars, lambda x: x.name == name)
+                mappings = target_mappings.scalars_by_name.get(name)
                 if mappings is None:
                     if add_unused_params:
                         nonlocal unused_parameter_offset
-                        node = nodes.new(type="ShaderNodeValue")
+                        node = new_node(type="ShaderNodeValue")
                         node.outputs[0].default_value = value
                         node.label = name
                         node.width = 250
@@ -949,72 +1037,76 @@ class DataImportTask:
                         unused_parameter_offset -= 100
                     return
 
-                value = mappings.value_func(value) if mappings.value_func else value
+                if value_func := mappings.value_func:
+                    value = value_func(value)
                 target_node.inputs[mappings.slot].default_value = value
                 if mappings.switch_slot:
                     target_node.inputs[mappings.switch_slot].default_value = 1 if value else 0
             except Exception as e:
-                traceback.print_exc()
+                report_param_error(data, e)
 
         def vector_param(data, target_mappings, target_node = shader_node, add_unused_params = False):
             try:
                 name = data.get("Name")
                 value = data.get("Value")
 
-                mappings = first(target_mappings.vectors, lambda x: x.name == name)
+                mappings = target_mappings.vectors_by_name.get(name)
                 if mappings is None:
                     if add_unused_params:
                         nonlocal unused_parameter_offset
-                        node = nodes.new(type="ShaderNodeRGB")
-                        node.outputs[0].default_value = (value["R"], value["G"], value["B"], value["A"])
+                        node = new_node(type="ShaderNodeRGB")
+                        node.outputs[0].default_value = get_rgba(value)
                         node.label = name
                         node.width = 250
                         node.location = 400, unused_parameter_offset
                         unused_parameter_offset -= 200
                     return
 
-                value = mappings.value_func(value) if mappings.value_func else value
-                target_node.inputs[mappings.slot].default_value = (value["R"], value["G"], value["B"], 1.0)
-                if mappings.alpha_slot:
-                    target_node.inputs[mappings.alpha_slot].default_value = value["A"]
-                if mappings.switch_slot:
-                    target_node.inputs[mappings.switch_slot].default_value = 1 if value else 0
+                if value_func := mappings.value_func:
+                    value = value_func(value)
+                inputs = target_node.inputs
+                inputs[mappings.slot].default_value = (*get_rgb(value), 1.0)
+                if alpha_slot := mappings.alpha_slot:
+                    inputs[alpha_slot].default_value = value["A"]
+                if switch_slot := mappings.switch_slot:
+                    inputs[switch_slot].default_value = 1 if value else 0
             except Exception as e:
-                traceback.print_exc()
+                report_param_error(data, e)
 
         def component_mask_param(data, target_mappings, target_node = shader_node, add_unused_params = False):
             try:
                 name = data.get("Name")
                 value = data.get("Value")
                 
-                mappings = first(target_mappings.component_masks, lambda x: x.name == name)
+                mappings = target_mappings.component_masks_by_name.get(name)
                 if mappings is None:
                     if add_unused_params:
                         nonlocal unused_parameter_offset
-                        node = nodes.new(type="ShaderNodeRGB")
-                        node.outputs[0].default_value = (value["R"], value["G"], value["B"], value["A"])
+                        node = new_node(type="ShaderNodeRGB")
+                        node.outputs[0].default_value = get_rgba(value)
                         node.label = name
                         node.width = 250
                         node.location = 400, unused_parameter_offset
                         unused_parameter_offset -= 200
                     return
 
-                value = mappings.value_func(value) if mappings.value_func else value
-                target_node.inputs[mappings.slot].default_value = (value["R"], value["G"], value["B"], value["A"])
+                if value_func := mappings.value_func:
+                    value = value_func(value)
+                target_node.inputs[mappings.slot].default_value = get_rgba(value)
             except Exception as e:
-                traceback.print_exc()
+                report_param_error(data, e)
 
         def switch_param(data, target_mappings, target_node = shader_node, add_unused_params = False):
             try:
                 name = data.get("Name")
                 value = data.get("Value")
 
-                mappings = first(target_mappings.switches, lambda x: x.name == name)
+                mappings = target_mappings.switches_by_name.get(name)
                 if mappings is None:
                     if add_unused_params:
                         nonlocal unused_parameter_offset
-                        node = nodes.new("ShaderNodeGroup")
-                        node.node_tree = bpy.data.node_groups.get("FP Switch")
+                        node = new_node("ShaderNodeGroup")
+                        node.node_tree = get_node_group("FP Switch")
                         node.inputs[0].default_value = 1 if value else 0
                         node.label = name
                         node.width = 250
@@ -1023,76 +1115,72 @@ class DataImportTask:
                     return
 
 
-                value = mappings.value_func(value) if mappings.value_func else value
+                if value_func := mappings.value_func:
+                    value = value_func(value)
                 target_node.inputs[mappings.slot].default_value = 1 if value else 0
             except Exception as e:
-                traceback.print_exc()
+                report_param_error(data, e)
                 
-        layer_switch_names = ["Use 2 Layers", "Use 3 Layers", "Use 4 Layers", "Use 5 Layers", "Use 6 Layers", "Use 7 Layers",
-            "Use 2 Materials", "Use 3 Materials", "Use 4 Materials", "Use 5 Materials", "Use 6 Materials", "Use 7 Materials",
-            "Use_Multiple_Material_Textures"]
-        extra_layer_names = ["Diffuse_Texture_2", "SpecularMasks_2", "Normals_Texture_2", "Emissive_Texture_2", 
-                             "Diffuse_Texture_3", "SpecularMasks_3", "Normals_Texture_3", "Emissive_Texture_3", 
-                             "Diffuse_Texture_4", "SpecularMasks_4", "Normals_Texture_4", "Emissive_Texture_4", 
-                             "Diffuse_Texture_5", "SpecularMasks_5", "Normals_Texture_5", "Emissive_Texture_5", 
-                             "Diffuse_Texture_6", "SpecularMasks_6", "Normals_Texture_6", "Emissive_Texture_6",]
-        if get_param_multiple(switches, layer_switch_names) and get_param_multiple(textures, extra_layer_names):
-            replace_shader_node("FP Layer")
-            socket_mappings = layer_mappings
-            shader_node.inputs["Is Transparent"].default_value = material_data.get("IsTransparent")
+        # later matches override earlier ones, test in reverse priority and build the shader node once
+        is_trunk = get_param(switches_by_name, "IsTrunk")
+        use_glass = material_data.get("UseGlassMaterial")
+        if material_data.get("UseFoliageMaterial") and not is_trunk:
+            shader_name = "FP Foliage"
+        elif use_glass:
+            shader_name = "FP Glass"
+        elif material_data.get("AbsoluteParent") == "M_FN_Valet_Master":
+            shader_name = "FP Valet"
+        elif any(get_param(textures_by_name, name) for name in ("LitDiffuse", "ShadedDiffuse")):
+            shader_name = "FP Toon"
+        elif get_param_multiple(switches_by_name, LAYER_SWITCH_NAMES) and get_param_multiple(textures_by_name, EXTRA_LAYER_NAMES):
+            shader_name = "FP Layer"
+        else:
+            shader_name = None
 
-        if any(["LitDiffuse", "ShadedDiffuse"], lambda x: get_param(textures, x)):
-            replace_shader_node("FP Toon")
-            socket_mappings = toon_mappings
+        if shader_name:
+            replace_shader_node(shader_name)
 
-        if material_data.get("AbsoluteParent") == "M_FN_Valet_Master":
-            replace_shader_node("FP Valet")
-            socket_mappings = valet_mappings
-            
-        if material_data.get("UseGlassMaterial"):
-            replace_shader_node("FP Glass")
-            socket_mappings = glass_mappings
+        if shader_name == "FP Layer":
+            shader_node.inputs["Is Transparent"].default_value = material_data.get("IsTransparent")
+
+        if use_glass:
             material.blend_method = "BLEND"
             material.show_transparent_back = False
 
-        is_trunk = get_param(switches, "IsTrunk")
+        if shader_name == "FP Foliage":
+            material.use_sss_translucency = True
+
         if is_trunk:
             socket_mappings = trunk_mappings
-
-        if material_data.get("UseFoliageMaterial") and not is_trunk:
-            replace_shader_node("FP Foliage")
-            socket_mappings = foliage_mappings
-            material.use_sss_translucency = True
             
+        param_setups = (
+            (textures, texture_param),
+            (scalars, scalar_param),
+            (vectors, vector_param),
+            (component_masks, component_mask_param),
+            (switches, switch_param),
+        )
+
         def setup_params(mappings, target_node, add_unused_params = False):
-            for texture in textures:
-                texture_param(texture, mappings, target_node, add_unused_params)
-    
-            for scalar in scalars:
-                scalar_param(scalar, mappings, target_node, add_unused_params)
-    
-            for vector in vectors:
-                vector_param(vector, mappings, target_node, add_unused_params)
-    
-            for component_mask in component_masks:
-                component_mask_param(component_mask, mappings, target_node, add_unused_params)
-    
-            for switch in switches:
-                switch_param(switch, mappings, target_node, add_unused_params)
+            for parameters, setup_param in param_setups:
+                for parameter in parameters:
+                    setup_param(parameter, mappings, target_node, add_unused_params)
 
-        setup_params(socket_mappings, shader_node, True)
+        setup_params(socket_mappings, shader_node, self.options.get("ImportUnusedParameters", True))
 
-        links.new(shader_node.outputs[0], output_node.inputs[0])
+        new_link(shader_node.outputs[0], output_node.inputs[0])
 
-        if material_name in ["MI_VertexCrunch", "M_VertexCrunch"] or get_param(scalars, "HT_CrunchVerts") == 1:
+        if material_name in VERTEX_CRUNCH_MATERIALS or get_param(scalars_by_name, "HT_CrunchVerts") == 1:
             material_slot.material["Crunch Verts"] = True
             return
 
         if shader_node.node_tree.name == "FP Material":
+            inputs = shader_node.inputs
+            diffuse_input = inputs["Diffuse"]
 
-            shader_node.inputs["AO"].default_value = self.options.get("AmbientOcclusion")
-            shader_node.inputs["Cavity"].default_value = self.options.get("Cavity")
-            shader_node.inputs["Subsurface"].default_value = self.options.get("Subsurface")
+            inputs["AO"].default_value = self.options.get("AmbientOcclusion")
+            inputs["Cavity"].default_value = self.options.get("Cavity")
+            inputs["Subsurface"].default_value = self.options.get("Subsurface")
 
             # find better detection to do this
             '''if (diffuse_links := shader_node.inputs["Diffuse"].links) and len(diffuse_links) > 0:
@@ -1100,32 +1188,26 @@ class DataImportTask:
 				links.new(diffuse_node.outputs[1], shader_node.inputs["Alpha"])'''
 
             if (skin_color := meta_data.get("SkinColor")) and skin_color["A"] != 0:
-                shader_node.inputs["Skin Color"].default_value = (skin_color["R"], skin_color["G"], skin_color["B"], 1.0)
-                shader_node.inputs["Skin Boost"].default_value = skin_color["A"]
-
-            emissive_toggle_names = [
-                "Emissive",
-                "UseBasicEmissive",
-                "UseAdvancedEmissive",
-                "Use Emissive"
-            ]
-            if get_param_multiple(switches, emissive_toggle_names) is False:
-                shader_node.inputs["Emission Strength"].default_value = 0
+                inputs["Skin Color"].default_value = (*get_rgb(skin_color), 1.0)
+                inputs["Skin Boost"].default_value = skin_color["A"]
+
+            if get_param_multiple(switches_by_name, EMISSIVE_TOGGLE_NAMES) is False:
+                inputs["Emission Strength"].default_value = 0
 
-            if get_param(textures, "SRM"):
-                shader_node.inputs["SwizzleRoughnessToGreen"].default_value = 1
+            if get_param(textures_by_name, "SRM"):
+                inputs["SwizzleRoughnessToGreen"].default_value = 1
 
-            if get_param(switches, "Use Vertex Colors for Mask"):
-                color_node = nodes.new(type="ShaderNodeVertexColor")
+            if get_param(switches_by_name, "Use Vertex Colors for Mask"):
+                color_node = new_node(type="ShaderNodeVertexColor")
                 color_node.location = [-400, -560]
                 color_node.layer_name = "COL0"
 
-                mask_node = nodes.new("ShaderNodeGroup")
-                mask_node.node_tree = bpy.data.node_groups.get("FP Vertex Alpha")
+                mask_node = new_node("ShaderNodeGroup")
+                mask_node.node_tree = get_node_group("FP Vertex Alpha")
                 mask_node.location = [-200, -560]
 
-                links.new(color_node.outputs[0], mask_node.inputs[0])
-                links.new(mask_node.outputs[0], shader_node.inputs["Alpha"])
+                new_link(color_node.outputs[0], mask_node.inputs[0])
+                new_link(mask_node.outputs[0], inputs["Alpha"])
 
                 for scalar in scalars:
                     name = scalar.get("Name")
@@ -1136,93 +1218,83 @@ class DataImportTask:
                     if input := mask_node.inputs.get(name.replace("Hide ", "")):
                         input.default_value = int(value)
 
-            emission_slot = shader_node.inputs["Emission"]
-            emission_crop_vector_params = [
-                "EmissiveUVs_RG_UpperLeftCorner_BA_LowerRightCorner",
-                "Emissive Texture UVs RG_TopLeft BA_BottomRight",
-                "Emissive 2 UV Positioning (RG)UpperLeft (BA)LowerRight",
-                "EmissiveUVPositioning (RG)UpperLeft (BA)LowerRight"
-            ]
-            
-            emission_crop_switch_params = [
-                "CroppedEmissive",
-                "Manipulate Emissive Uvs"
-            ]
-            
-            if (crop_bounds := get_param_multiple(vectors, emission_crop_vector_params)) and get_param_multiple(switches, emission_crop_switch_params) and len(emission_slot.links) > 0:
+            emission_slot = inputs["Emission"]
+            if (crop_bounds := get_param_multiple(vectors_by_name, EMISSION_CROP_VECTOR_NAMES)) and get_param_multiple(switches_by_name, EMISSION_CROP_SWITCH_NAMES) and len(emission_slot.links) > 0:
                 emission_node = emission_slot.links[0].from_node
                 emission_node.extension = "CLIP"
 
-                crop_texture_node = nodes.new("ShaderNodeGroup")
-                crop_texture_node.node_tree = bpy.data.node_groups.get("FP Texture Cropping")
+                crop_texture_node = new_node("ShaderNodeGroup")
+                crop_texture_node.node_tree = get_node_group("FP Texture Cropping")
                 crop_texture_node.location = emission_node.location + Vector((-200, 25))
                 crop_texture_node.inputs["Left"].default_value = crop_bounds.get('R')
                 crop_texture_node.inputs["Top"].default_value = crop_bounds.get('G')
                 crop_texture_node.inputs["Right"].default_value = crop_bounds.get('B')
                 crop_texture_node.inputs["Bottom"].default_value = crop_bounds.get('A')
-                links.new(crop_texture_node.outputs[0], emission_node.inputs[0])
+                new_link(crop_texture_node.outputs[0], emission_node.inputs[0])
 
 
-            if get_param(switches, "Modulate Emissive with Diffuse"):
-                diffuse_node = shader_node.inputs["Diffuse"].links[0].from_node
-                links.new(diffuse_node.outputs[0], shader_node.inputs["Emission Multiplier"])
+            if get_param(switches_by_name, "Modulate Emissive with Diffuse"):
+                diffuse_node = diffuse_input.links[0].from_node
+                new_link(diffuse_node.outputs[0], inputs["Emission Multiplier"])
                 
-            if get_param(switches, "useGmapGradientLayers"):
-                gradient_node = nodes.new(type="ShaderNodeGroup")
-                gradient_node.node_tree = bpy.data.node_groups.get("FP Gradient")
+            if get_param(switches_by_name, "useGmapGradientLayers"):
+                gradient_node = new_node(type="ShaderNodeGroup")
+                gradient_node.node_tree = get_node_group("FP Gradient")
                 gradient_node.location = -500, 0
-                nodes.remove(shader_node.inputs["Diffuse"].links[0].from_node)
-                links.new(gradient_node.outputs[0], shader_node.inputs[0])
+                nodes.remove(diffuse_input.links[0].from_node)
+                new_link(gradient_node.outputs[0], inputs[0])
                 
-                gmap_node = nodes.new("ShaderNodeValue")
+                gmap_node = new_node("ShaderNodeValue")
                 gmap_node.location = -1000, -120
                 gmap_node.outputs[0].default_value = 1
                 
                 setup_params(gradient_mappings, gradient_node)
                 
-                for item in gradient_node.node_tree.interface.items_tree:
-                    if item.name != "Colors":
-                        continue
-                        
-                    panel_items = item.interface_items
-                    for panel_item in panel_items:
-                        item_links = gradient_node.inputs[panel_item.name].links
-                        if len(item_links) == 0:
+                if colors_panel := first(gradient_node.node_tree.interface.items_tree, lambda item: item.name == "Colors"):
+                    # first socket wins for duplicate names, same as inputs[name]
+                    inputs_by_name = {}
+                    for socket in gradient_node.inputs:
+                        inputs_by_name.setdefault(socket.name, socket)
+
+                    gmap_output = gmap_node.outputs[0]
+                    for panel_item in colors_panel.interface_items:
+                        if (socket := inputs_by_name.get(panel_item.name)) is None:
+                            continue
+                        if not (item_links := socket.links):
                             continue
-                        links.new(gmap_node.outputs[0], item_links[0].from_node.inputs[0])
+                        new_link(gmap_output, item_links[0].from_node.inputs[0])
                         
-            if eye_texture_data := get_param_data(textures, "EyeTexture"):
-                eye_texture_node = nodes.new(type="ShaderNodeTexImage")
+            if eye_texture_data := get_param_data(textures_by_name, "EyeTexture"):
+                eye_texture_node = new_node(type="ShaderNodeTexImage")
                 eye_texture_node.image = self.import_image(eye_texture_data.get("Value"))
-                eye_texture_node.image.alpha_mode = 'CHANNEL_PACKED'
-                eye_texture_node.image.colorspace_settings.name = "sRGB" if eye_texture_data.get("sRGB") else "Non-Color"
+                setup_image(eye_texture_node.image, eye_texture_data.get("sRGB"))
                 eye_texture_node.interpolation = "Smart"
                 eye_texture_node.hide = True
                 eye_texture_node.location = [-500, -75]
 
-                uv_map_node = nodes.new(type="ShaderNodeUVMap")
+                uv_map_node = new_node(type="ShaderNodeUVMap")
                 uv_map_node.location = [-700, 25]
                 uv_map_node.uv_map = "UV1"
         
-                links.new(uv_map_node.outputs[0], eye_texture_node.inputs[0])
+                new_link(uv_map_node.outputs[0], eye_texture_node.inputs[0])
         
-                mix_node = nodes.new(type="ShaderNodeMixRGB")
+                mix_node = new_node(type="ShaderNodeMixRGB")
                 mix_node.location = [-200, 75]
         
-                links.new(eye_texture_node.outputs[0], mix_node.inputs[2])
+                new_link(eye_texture_node.outputs[0], mix_node.inputs[2])
         
-                compare_node = nodes.new(type="ShaderNodeMath")
+                compare_node = new_node(type="ShaderNodeMath")
                 compare_node.operation = 'COMPARE'
                 compare_node.hide = True
                 compare_node.location = [-500, 100]
                 compare_node.inputs[1].default_value = 0.510
-                links.new(uv_map_node.outputs[0], compare_node.inputs[0])
-                links.new(compare_node.outputs[0], mix_node.inputs[0])
+                new_link(uv_map_node.outputs[0], compare_node.inputs[0])
+                new_link(compare_node.outputs[0], mix_node.inputs[0])
 
-                diffuse_node = shader_node.inputs["Diffuse"].links[0].from_node
+                diffuse_node = diffuse_input.links[0].from_node
                 diffuse_node.location = [-500, 0]
-                links.new(diffuse_node.outputs[0], mix_node.inputs[1])
-                links.new(mix_node.outputs[0], shader_node.inputs["Diffuse"])
+                new_link(diffuse_node.outputs[0], mix_node.inputs[1])
+                new_link(mix_node.outputs[0], diffuse_input)
 
 
         if shader_node.node_tree.name == "FP Toon":
@@ -1230,60 +1302,72 @@ class DataImportTask:
             self.is_toon = True
             
             
+    def format_asset_path(self, path: str, suffix: str):
+        # join against the cached folder prefix instead of os.path.join per asset
+        path = path[1:] if path[:1] == "/" else path
+        return self.assets_folder_prefix + path + suffix
+
+    def path_exists(self, path: str):
+        if (exists := self.path_exists_cache.get(path)) is None:
+            exists = self.path_exists_cache[path] = os.path.exists(path)
+        return exists
+
     def format_image_path(self, path: str):
-        path, name = path.split(".")
-        path = path[1:] if path.startswith("/") else path
-        ext = "png"
-        texture_path = os.path.join(self.assets_folder, path + "." + ext)
+        path, _, name = path.partition(".")
+        texture_path = self.format_asset_path(path, ".png")
         return texture_path, name
 
     def import_image(self, path: str):
-        path, name = self.format_image_path(path)
-        if existing := bpy.data.images.get(name):
-            return existing
+        if cached := self.image_cache.get(path):
+            return cached
 
-        if not os.path.exists(path):
-            return None
+        texture_path, name = self.format_image_path(path)
+        if not (image := bpy.data.images.get(name)):
+            if not self.path_exists(texture_path):
+                return None
 
-        return bpy.data.images.load(path, check_existing=True)
+            image = bpy.data.images.load(texture_path, check_existing=True)
+
+        self.image_cache[path] = image
+        return image
 
     def import_mesh(self, path: str, num_lods):
-        options = UEModelOptions(scale_factor=0.01 if self.options.get("ScaleDown") else 1,
+        from .ue_format import UEFormatImport, UEModelOptions
+        options = UEModelOptions(scale_factor=self.scale_factor,
                                  reorient_bones=self.options.get("ReorientBones"),
                                  bone_length=self.options.get("BoneSize"))
 
-        path = path[1:] if path.startswith("/") else path
+        file_path = path.partition(".")[0]
         
-        lod_mesh_path = os.path.join(self.assets_folder, path.split(".")[0] + f"_LOD{str(min(num_lods - 1, self.options.get('LevelOfDetail')))}" + ".uemodel")
-        normal_mesh_path = os.path.join(self.assets_folder, path.split(".")[0] + ".uemodel")
-        mesh_path = lod_mesh_path if os.path.exists(lod_mesh_path) else normal_mesh_path
+        level_of_detail = min(num_lods - 1, self.options.get("LevelOfDetail"))
+        lod_mesh_path = self.format_asset_path(file_path, f"_LOD{level_of_detail}.uemodel")
+        mesh_path = lod_mesh_path if self.path_exists(lod_mesh_path) else self.format_asset_path(file_path, ".uemodel")
         
         return UEFormatImport(options).import_file(mesh_path)
 
     def import_anim(self, path: str, override_skeleton=None):
-        path = path[1:] if path.startswith("/") else path
-        file_path, name = path.split(".")
+        file_path, _, name = path.partition(".")
         if (existing := bpy.data.actions.get(name)) and existing["Skeleton"] == override_skeleton.name:
             return existing
 
-        anim_path = os.path.join(self.assets_folder, file_path + ".ueanim")
+        from .ue_format import UEFormatImport, UEAnimOptions
+        anim_path = self.format_asset_path(file_path, ".ueanim")
         options = UEAnimOptions(link=False,
                                 override_skeleton=override_skeleton,
-                                scale_factor=0.01 if self.options.get("ScaleDown") else 1)
+                                scale_factor=self.scale_factor)
         anim = UEFormatImport(options).import_file(anim_path)
         anim["Skeleton"] = override_skeleton.name
         return anim
 
     def import_sound(self, path: str, time):
-        path = path[1:] if path.startswith("/") else path
-        file_path, name = path.split(".")
+        file_path, _, name = path.partition(".")
         if existing := bpy.data.sounds.get(name):
             return existing
         
         if not bpy.context.scene.sequence_editor:
             bpy.context.scene.sequence_editor_create()
 
-        sound_path = os.path.join(self.assets_folder, file_path + ".wav")
+        sound_path = self.format_asset_path(file_path, ".wav")
         sound = bpy.context.scene.sequence_editor.sequences.new_sound(name, sound_path, 0, time)
         sound["FPSound"] = True
         return sound
@@ -1295,6 +1379,50 @@ def get_socket_pos(node, index):
     return node.location.x, node.location.y + start_y + offset_y * index
 
 
+def setup_image(image, srgb):
+    # skip redundant writes, each one triggers an image update
+    if image.alpha_mode != 'CHANNEL_PACKED':
+        image.alpha_mode = 'CHANNEL_PACKED'
+
+    colorspace = "sRGB" if srgb else "Non-Color"
+    if image.colorspace_settings.name != colorspace:
+        image.colorspace_settings.name = colorspace
+
+
+socket_index_cache = {}
+
+def find_socket_index(node, slot):
+    # node groups come from the bundled data blend, so socket order never changes
+    key = (node.node_tree.name, slot)
+    index = socket_index_cache.get(key)
+    if index is None:
+        index = node.inputs.find(slot)
+        socket_index_cache[key] = index
+    return index
+
+
+def has_triangles(mesh_data):
+    loop_totals = np.empty(len(mesh_data.polygons), dtype=np.int32)
+    mesh_data.polygons.foreach_get("loop_total", loop_totals)
+    return bool((loop_totals == 3).any())
+
+
+def remove_faces_by_material(mesh_data, material_indices):
+    face_material_indices = np.empty(len(mesh_data.polygons), dtype=np.int32)
+    mesh_data.polygons.foreach_get("material_index", face_material_indices)
+    face_indices = np.flatnonzero(np.isin(face_material_indices, material_indices))
+    if len(face_indices) == 0:
+        return
+
+    import bmesh
+    bm = bmesh.new()
+    bm.from_mesh(mesh_data)
+    bm.faces.ensure_lookup_table()
+    bmesh.ops.delete(bm, geom=[bm.faces[index] for index in face_indices.tolist()], context='FACES')
+    bm.to_mesh(mesh_data)
+    bm.free()
+
+
 def hash_code(num):
     return hex(abs(num))[2:]
 
@@ -1327,6 +1455,17 @@ def armature_from_selection():
 def time_to_frame(time, fps = 30):
     return int(round(time * fps))
 
+node_group_cache = {}
+
+def get_node_group(name):
+    # only valid between append_data calls, which refresh it
+    node_group = node_group_cache.get(name)
+    if node_group is None:
+        node_group = bpy.data.node_groups.get(name)
+        node_group_cache[name] = node_group
+    return node_group
+
+
 def append_data():
     addon_dir = os.path.dirname(os.path.splitext(__file__)[0])
     with bpy.data.libraries.load(os.path.join(addon_dir, "fortnite_porting_data.blend")) as (data_from, data_to):
@@ -1342,6 +1481,14 @@ def append_data():
             if not bpy.data.objects.get(obj):
                 data_to.objects.append(obj)
 
+    node_group_cache.clear()
+    socket_index_cache.clear()
+
+
+def deselect_all():
+    for obj in bpy.context.selected_objects:
+        obj.select_set(False)
+
 
 def create_collection(name):
     if name in bpy.context.view_layer.layer_collection.children:
@@ -1356,7 +1503,7 @@ def create_collection(name):
     return new_collection
 
 
-def constraint_object(child: bpy.types.Object, parent: bpy.types.Object, bone: str, rot=[0, radians(90), 0]):
+def constraint_object(child: bpy.types.Object, parent: bpy.types.Object, bone: str, rot=[0, pi / 2, 0]):
     constraint = child.constraints.new('CHILD_OF')
     constraint.target = parent
     constraint.subtarget = bone
@@ -1365,10 +1512,33 @@ def constraint_object(child: bpy.types.Object, parent: bpy.types.Object, bone: s
     constraint.inverse_matrix = Matrix()
 
 
+def constraint_bone(bone, constraint_type, target, subtarget, **properties):
+    constraint = bone.constraints.new(constraint_type)
+    constraint.target = target
+    constraint.subtarget = subtarget
+    for name, value in properties.items():
+        setattr(constraint, name, value)
+    return constraint
+
+
 def make_vector(data, mirror_y=False):
     return Vector((data.get("X"), data.get("Y") * (-1 if mirror_y else 1), data.get("Z")))
 
 
+def make_transforms(meshes):
+    # world imports place thousands of actors, convert every transform in one pass
+    locations, rotations, scales = [], [], []
+    for mesh in meshes:
+        location, rotation, scale = mesh.get("Location"), mesh.get("Rotation"), mesh.get("Scale")
+        locations.append((location.get("X"), -location.get("Y"), location.get("Z")))
+        rotations.append((rotation.get("Roll"), -rotation.get("Pitch"), -rotation.get("Yaw")))
+        scales.append((scale.get("X"), scale.get("Y"), scale.get("Z")))
+
+    locations = np.array(locations, dtype=np.float64) * 0.01
+    rotations = np.radians(np.array(rotations, dtype=np.float64))
+    return zip(locations.tolist(), rotations.tolist(), scales)
+
+
 def make_quat(data):
     return Quaternion((-data.get("W"), data.get("X"), -data.get("Y"), data.get("Z")))
 
@@ -1385,21 +1555,6 @@ def first(target, expr, default=None):
     return next(filtered, default)
 
 
-def where(target, expr):
-    if not target:
-        return []
-    filtered = filter(expr, target)
-
-    return list(filtered)
-
-
-def any(target, expr):
-    if not target:
-        return False
-
-    filtered = list(filter(expr, target))
-    return len(filtered) > 0
-
 def add_unique(target, item):
     if item in target:
         return
@@ -1414,28 +1569,44 @@ def get_case_insensitive(source, string):
     return None
 
 
+def get_slots_by_name(material_slots):
+    slots_by_name = {}
+    for slot in material_slots:
+        slots_by_name.setdefault(slot.name.casefold(), []).append(slot)
+    return slots_by_name
+
+
+def index_parameters(parameters):
+    # keep the first parameter for a name to match the old linear search
+    return {parameter.get("Name"): parameter for parameter in reversed(parameters)}
+
+
 def replace_or_add_parameter(list, replace_item):
     if replace_item is None:
         return
+
+    name = replace_item.get("Name")
+    replaced = False
     for index, item in enumerate(list):
         if item is None:
             continue
 
-        if item.get("Name") == replace_item.get("Name"):
+        if item.get("Name") == name:
             list[index] = replace_item
+            replaced = True
 
-    if not any(list, lambda x: x.get("Name") == replace_item.get("Name")):
+    if not replaced:
         list.append(replace_item)
 
 
 def merge_skeletons(parts):
-    bpy.ops.object.select_all(action='DESELECT')
+    deselect_all()
 
     merge_parts = []
     constraint_parts = []
 
     for part in parts:
-        if (meta := part.get("Meta")) and meta.get("AttachToSocket") and meta.get("Socket") not in ["Face", "Helmet", None]:
+        if (meta := part.get("Meta")) and meta.get("AttachToSocket") and meta.get("Socket") not in MERGED_SOCKETS:
             constraint_parts.append(part)
         else:
             merge_parts.append(part)
@@ -1454,7 +1625,7 @@ def merge_skeletons(parts):
     bpy.ops.object.join()
     master_skeleton = bpy.context.active_object
     master_mesh = get_armature_mesh(bpy.context.active_object)
-    bpy.ops.object.select_all(action='DESELECT')
+    deselect_all()
 
     # merge meshes
     for part in merge_parts:
@@ -1468,25 +1639,24 @@ def merge_skeletons(parts):
         mesh.select_set(True)
 
     bpy.ops.object.join()
-    bpy.ops.object.select_all(action='DESELECT')
+    deselect_all()
 
     # rebuild master bone tree
     bone_tree = {}
     for bone in master_skeleton.data.bones:
-        try:
-            bone_reg = re.sub(".\d\d\d", "", bone.name)
-            parent_reg = re.sub(".\d\d\d", "", bone.parent.name)
-            bone_tree[bone_reg] = parent_reg
-        except AttributeError:
-            pass
+        parent = bone.parent
+        if parent is None: continue
+
+        bone_reg = DUPLICATE_SUFFIX_PATTERN.sub("", bone.name)
+        parent_reg = DUPLICATE_SUFFIX_PATTERN.sub("", parent.name)
+        bone_tree[bone_reg] = parent_reg
 
     bpy.context.view_layer.objects.active = master_skeleton
     bpy.ops.object.mode_set(mode='EDIT')
-    bpy.ops.armature.select_all(action='DESELECT')
-    bpy.ops.object.select_pattern(pattern="*.[0-9][0-9][0-9]")
-    bpy.ops.armature.delete()
 
     skeleton_bones = master_skeleton.data.edit_bones
+    for bone in [bone for bone in skeleton_bones if DUPLICATE_SUFFIX_PATTERN.search(bone.name)]:
+        skeleton_bones.remove(bone)
 
     for bone, parent in bone_tree.items():
         if target_bone := skeleton_bones.get(bone):
@@ -1538,21 +1708,242 @@ def bone_hierarchy_has_vertex_groups(bone, vertex_groups):
         bone_list.extend(bone.children)
     return False
 
-class LazyInit:
-    
-    def __init__(self, gen):
-        self.gen = gen
+# shared by the shape table, assigning to custom_shape_rotation_euler copies the values
+TASTY_ROTATION_X90 = Euler((pi / 2, 0, 0))
+TASTY_ROTATION_NEG_Y90 = Euler((0, -pi / 2, 0))
+TASTY_ROTATION_Z180 = Euler((0, 0, pi))
+
+# (bone, shape, scale, *rotation euler or use bone size)
+TASTY_BONE_SHAPES = (
+    ("root", "RIG_Root", 0.75, TASTY_ROTATION_X90),
+    ("pelvis", "RIG_Torso", 1.5, TASTY_ROTATION_NEG_Y90),
+    ("spine_01", "RIG_Hips", 2.2),
+    ("spine_02", "RIG_Hips", 1.8),
+    ("spine_03", "RIG_Hips", 1.6),
+    ("spine_04", "RIG_Hips", 1.2),
+    ("spine_05", "RIG_Hips", 1.6),
+    ("neck_01", "RIG_Hips", 2.0),
+    ("neck_02", "RIG_Hips", 1.4),
+    ("head", "RIG_Hips", 2.6),
+
+    ('clavicle_r', 'RIG_Shoulder', 1.0),
+    ('clavicle_l', 'RIG_Shoulder', 1.0),
+
+    ('upperarm_twist_01_r', 'RIG_Forearm', 0.13, False),
+    ('upperarm_twist_02_r', 'RIG_Forearm', 0.10, False),
+    ('lowerarm_twist_01_r', 'RIG_Forearm', 0.13, False),
+    ('lowerarm_twist_02_r', 'RIG_Forearm', 0.13, False),
+    ('upperarm_twist_01_l', 'RIG_Forearm', 0.13, False),
+    ('upperarm_twist_02_l', 'RIG_Forearm', 0.10, False),
+    ('lowerarm_twist_01_l', 'RIG_Forearm', 0.13, False),
+    ('lowerarm_twist_02_l', 'RIG_Forearm', 0.13, False),
+
+    ('thigh_twist_01_r', 'RIG_Tweak', 0.15, False),
+    ('calf_twist_01_r', 'RIG_Tweak', 0.13, False),
+    ('calf_twist_02_r', 'RIG_Tweak', 0.2, False),
+    ('thigh_twist_01_l', 'RIG_Tweak', 0.15, False),
+    ('calf_twist_01_l', 'RIG_Tweak', 0.13, False),
+    ('calf_twist_02_l', 'RIG_Tweak', 0.2, False),
+
+    ("ik_foot_parent_r", "RIG_FootR", 1.0),
+    ("ik_foot_parent_l", "RIG_FootL", 1.0, TASTY_ROTATION_NEG_Y90),
+    ("ik_foot_pole_r", "RIG_Tweak", 0.75),
+    ("ik_foot_pole_l", "RIG_Tweak", 0.75),
+    ("ik_foot_ctrl_r", "RIG_Ctrl", 7.5, TASTY_ROTATION_X90),
+    ("ik_foot_ctrl_l", "RIG_Ctrl", 7.5, TASTY_ROTATION_X90),
+
+    ("ik_hand_parent_r", "RIG_Hand", 2.2),
+    ("ik_hand_target_r", "RIG_Ctrl", 7.5, TASTY_ROTATION_NEG_Y90),
+    ("ik_hand_pole_r", "RIG_Tweak", 0.75),
+    ("ik_finger_thumb_r", "RIG_Finger", 1.0, TASTY_ROTATION_Z180),
+    ("ik_finger_index_r", "RIG_Finger", 1.0, TASTY_ROTATION_Z180),
+    ("ik_finger_middle_r", "RIG_Finger", 1.0, TASTY_ROTATION_Z180),
+    ("ik_finger_ring_r", "RIG_Finger", 1.0, TASTY_ROTATION_Z180),
+    ("ik_finger_pinky_r", "RIG_Finger", 1.0, TASTY_ROTATION_Z180),
+
+    ("ik_hand_parent_l", "RIG_Hand", 2.2),
+    ("ik_hand_target_l", "RIG_Ctrl", 7.5, TASTY_ROTATION_NEG_Y90),
+    ("ik_hand_pole_l", "RIG_Tweak", 0.75),
+    ("ik_finger_thumb_l", "RIG_Finger", 1.0, TASTY_ROTATION_Z180),
+    ("ik_finger_index_l", "RIG_Finger", 1.0, TASTY_ROTATION_Z180),
+    ("ik_finger_middle_l", "RIG_Finger", 1.0, TASTY_ROTATION_Z180),
+    ("ik_finger_ring_l", "RIG_Finger", 1.0, TASTY_ROTATION_Z180),
+    ("ik_finger_pinky_l", "RIG_Finger", 1.0, TASTY_ROTATION_Z180),
+
+    ("index_control_r", "RIG_FingerRotR", 1.0),
+    ("middle_control_r", "RIG_FingerRotR", 1.0),
+    ("ring_control_r", "RIG_FingerRotR", 1.0),
+    ("pinky_control_r", "RIG_FingerRotR", 1.0),
+
+    ("index_control_l", "RIG_FingerRotR", 1.0),
+    ("middle_control_l", "RIG_FingerRotR", 1.0),
+    ("ring_control_l", "RIG_FingerRotR", 1.0),
+    ("pinky_control_l", "RIG_FingerRotR", 1.0),
+
+    ("eye_control_parent", "RIG_EyeTrackMid", 0.75, False),
+    ("eye_control_r", "RIG_EyeTrackInd", 0.75, False),
+    ("eye_control_l", "RIG_EyeTrackInd", 0.75, False),
+
+    ("C_jaw", "RIG_JawBone", 0.1, False),
+    ("FACIAL_C_Jaw", "RIG_JawBone", 0.1, False),
+)
 
-    def load(self):
-        try:
-            self.data = self.gen()
-            return True
-        except Exception as e:
-            return False
+# every shape object the tasty rig uses, resolved once per rig
+TASTY_SHAPE_NAMES = frozenset({shape_name for _, shape_name, *_ in TASTY_BONE_SHAPES} | {"RIG_Dynamic", "RIG_FaceBone"})
+
+# keys into the collections apply_tasty_rig creates
+TASTY_EXPLICIT_COLLECTIONS = {
+    "pelvis": "main",
+    "spine_01": "main",
+    "spine_02": "main",
+    "spine_03": "main",
+    "spine_04": "main",
+    "spine_05": "main",
+    "clavicle_r": "main",
+    "clavicle_l": "main",
+    "neck_01": "main",
+    "neck_02": "main",
+    "head": "main",
+    "ik_foot_parent_r": "ik",
+    "ik_foot_parent_l": "ik",
+    "ik_foot_ctrl_r": "ik",
+    "ik_foot_ctrl_l": "ik",
+    "ik_foot_pole_r": "ik",
+    "ik_foot_pole_l": "ik",
+
+    "ik_hand_parent_r": "ik",
+    "ik_hand_target_r": "ik",
+    "ik_hand_pole_r": "ik",
+    "ik_finger_thumb_r": "ik",
+    "ik_finger_index_r": "ik",
+    "ik_finger_middle_r": "ik",
+    "ik_finger_ring_r": "ik",
+    "ik_finger_pinky_r": "ik",
+
+    "ik_hand_parent_l": "ik",
+    "ik_hand_target_l": "ik",
+    "ik_hand_pole_l": "ik",
+    "ik_finger_thumb_l": "ik",
+    "ik_finger_index_l": "ik",
+    "ik_finger_middle_l": "ik",
+    "ik_finger_ring_l": "ik",
+    "ik_finger_pinky_l": "ik",
+
+    "index_control_r": "ik",
+    "middle_control_r": "ik",
+    "ring_control_r": "ik",
+    "pinky_control_r": "ik",
+
+    "index_control_l": "ik",
+    "middle_control_l": "ik",
+    "ring_control_l": "ik",
+    "pinky_control_l": "ik",
+
+    "eye_control_parent": "face",
+    "eye_control_r": "face",
+    "eye_control_l": "face",
+}
+
+TASTY_FACE_ROOT_BONES = frozenset({"faceAttach", "FACIAL_C_FacialRoot"})
+TASTY_EYELID_TAGS = ("eyelid", "eye_lid")
+
+# (bone, target, pole, chain length, use rotation, finger ik only)
+TASTY_IK_BONES = (
+    ("calf_r", "ik_foot_target_r", "ik_foot_pole_r", 2, False, False),
+    ("calf_l", "ik_foot_target_l", "ik_foot_pole_l", 2, False, False),
+
+    ("lowerarm_r", "ik_hand_target_r", "ik_hand_pole_r", 2, False, False),
+    ("thumb_03_r", "ik_finger_thumb_r", None, 3, True, True),
+    ("index_03_r", "ik_finger_index_r", None, 4, True, True),
+    ("middle_03_r", "ik_finger_middle_r", None, 4, True, True),
+    ("ring_03_r", "ik_finger_ring_r", None, 4, True, True),
+    ("pinky_03_r", "ik_finger_pinky_r", None, 4, True, True),
+    ("phantom_thumb_03_r", "ik_finger_thumb_r", None, 3, True, True),
+    ("phantom_index_03_r", "ik_finger_index_r", None, 4, True, True),
+    ("phantom_middle_03_r", "ik_finger_middle_r", None, 4, True, True),
+    ("phantom_ring_03_r", "ik_finger_ring_r", None, 4, True, True),
+    ("phantom_pinky_03_r", "ik_finger_pinky_r", None, 4, True, True),
+
+    ("lowerarm_l", "ik_hand_target_l", "ik_hand_pole_l", 2, False, False),
+    ("thumb_03_l", "ik_finger_thumb_l", None, 3, True, True),
+    ("index_03_l", "ik_finger_index_l", None, 4, True, True),
+    ("middle_03_l", "ik_finger_middle_l", None, 4, True, True),
+    ("ring_03_l", "ik_finger_ring_l", None, 4, True, True),
+    ("pinky_03_l", "ik_finger_pinky_l", None, 4, True, True),
+    ("phantom_thumb_03_l", "ik_finger_thumb_l", None, 3, True, True),
+    ("phantom_index_03_l", "ik_finger_index_l", None, 4, True, True),
+    ("phantom_middle_03_l", "ik_finger_middle_l", None, 4, True, True),
+    ("phantom_ring_03_l", "ik_finger_ring_l", None, 4, True, True),
+    ("phantom_pinky_03_l", "ik_finger_pinky_l", None, 4, True, True),
+
+    ("dog_ball_r", "ik_dog_ball_r", "ik_foot_pole_r", 3, True, False),
+    ("dog_ball_l", "ik_dog_ball_l", "ik_foot_pole_l", 3, True, False),
+    ("wolf_ball_r", "ik_wolf_ball_r", "ik_foot_pole_r", 3, True, False),
+    ("wolf_ball_l", "ik_wolf_ball_l", "ik_foot_pole_l", 3, True, False),
+)
+
+TASTY_FINGER_IK_CONTROLS = (
+    "ik_finger_thumb_r",
+    "ik_finger_index_r",
+    "ik_finger_middle_r",
+    "ik_finger_ring_r",
+    "ik_finger_pinky_r",
+
+    "ik_finger_thumb_l",
+    "ik_finger_index_l",
+    "ik_finger_middle_l",
+    "ik_finger_ring_l",
+    "ik_finger_pinky_l",
+
+    "ik_hand_target_r",
+    "ik_hand_target_l",
+)
+
+TASTY_FINGER_FK_CONTROLS = (
+    "index_control_r",
+    "middle_control_r",
+    "ring_control_r",
+    "pinky_control_r",
 
-    def get(self):
-        return self.data
+    "index_control_l",
+    "middle_control_l",
+    "ring_control_l",
+    "pinky_control_l",
+)
+
+# (bone prefix, rotation axis, copy rotation mix mode, left limits, right limits)
+TASTY_FOOT_ROLL_BONES = (
+    ("ik_foot_roll_inner", "y", "REPLACE", (-pi, 0), (0, pi)),
+    ("ik_foot_roll_outer", "y", "REPLACE", (0, pi), (-pi, 0)),
+    ("ik_foot_roll_front", "x", "REPLACE", (-pi, 0), (-pi, 0)),
+    ("ik_foot_roll_back", "x", "REPLACE", (0, pi), (0, pi)),
+    ("ball", "x", "ADD", (-pi, 0), (-pi, 0)),
+)
 
+TASTY_HIDE_BONES = (
+    "ik_foot_roll_inner_r",
+    "ik_foot_roll_outer_r",
+    "ik_foot_roll_front_r",
+    "ik_foot_roll_back_r",
+    "ik_foot_target_r",
+    "foot_r",
+    "ball_r",
+    "ik_dog_ball_r",
+    "ik_wolf_ball_r",
+
+    "ik_foot_roll_inner_l",
+    "ik_foot_roll_outer_l",
+    "ik_foot_roll_front_l",
+    "ik_foot_roll_back_l",
+    "ik_foot_target_l",
+    "foot_l",
+    "ball_l",
+    "ik_dog_ball_l",
+    "ik_wolf_ball_l",
+
+    "hand_r",
+    "hand_l",
+)
 
 def apply_tasty_rig(master_skeleton, scale, use_finger_ik = True, use_dyn_bone_shape = True):
     master_skeleton["is_tasty_rig"] = True
@@ -1566,78 +1957,98 @@ def apply_tasty_rig(master_skeleton, scale, use_finger_ik = True, use_dyn_bone_s
     face_collection = armature_data.collections.new("Face Bones")
     extra_collection = armature_data.collections.new("Extra Bones")
 
-
+    # single edit -> object round trip, all edit bone changes happen before leaving edit mode
     bpy.ops.object.mode_set(mode='EDIT')
 
     edit_bones = armature_data.edit_bones
 
+    # snapshot once, missing source bones are skipped instead of raising
+    bones_by_name = {bone.name: bone for bone in edit_bones}
+
+    # constant offsets, pre-scaled once instead of rebuilt per bone
+    foot_ctrl_offset = Vector((0, 0.2, 0)) * scale
+    foot_roll_offset = 0.04 * scale
+    foot_roll_back_offset = 0.065 * scale
+    foot_pole_head_offset = Vector((0, -0.75, 0)) * scale
+    foot_pole_tail_offset = Vector((0, -0.75, -0.2)) * scale
+    hand_pole_head_offset = Vector((0, 0.75, 0)) * scale
+    hand_pole_tail_offset = Vector((0, 0.75, -0.2)) * scale
+    eye_control_parent_head_offset = Vector((0, -0.675, 0)) * scale
+    eye_control_parent_tail_offset = Vector((0, -0.7, 0)) * scale
+    eye_control_offset = Vector((0.0325, 0, 0)) * scale
+    calf_head_offset = Vector((0.0075, 0, 0))
+    face_tail_offset = Vector((0, 0.1, 0)) * scale
+    finger_control_translation = Matrix.Translation(Vector((0.025, 0.0, 0.0)))
+
     new_bones = [
-        ("tasty_root", "root", LazyInit(lambda: (edit_bones["root"].head, edit_bones["root"].tail, edit_bones["root"].roll))),
+        ("tasty_root", "root", "root", lambda bone: (bone.head, bone.tail, bone.roll)),
         
-        ("ik_foot_parent_r", "tasty_root", LazyInit(lambda: (edit_bones["foot_r"].head, edit_bones["foot_r"].tail, edit_bones["foot_r"].roll))),
-        ("ik_foot_ctrl_r", "ik_foot_parent_r", LazyInit(lambda: (edit_bones["ball_r"].head + Vector((0, 0.2, 0)) * scale, edit_bones["ball_r"].tail + Vector((0, 0.2, 0)) * scale, 0))),
-        ("ik_foot_roll_inner_r", "ik_foot_parent_r", LazyInit(lambda: (Vector((edit_bones["ball_r"].head.x + 0.04 * scale, edit_bones["ball_r"].head.y, 0)), Vector((edit_bones["ball_r"].tail.x + 0.04 * scale, edit_bones["ball_r"].tail.y, 0)), 0))),
-        ("ik_foot_roll_outer_r", "ik_foot_roll_inner_r", LazyInit(lambda: (Vector((edit_bones["ball_r"].head.x - 0.04 * scale, edit_bones["ball_r"].head.y, 0)), Vector((edit_bones["ball_r"].tail.x - 0.04 * scale, edit_bones["ball_r"].tail.y, 0)), 0))),
-        ("ik_foot_roll_front_r", "ik_foot_roll_outer_r", LazyInit(lambda: (edit_bones["ball_r"].head, edit_bones["ball_r"].tail, radians(180)))),
-        ("ik_foot_roll_back_r", "ik_foot_roll_front_r", LazyInit(lambda: (Vector((edit_bones["foot_r"].head.x, edit_bones["foot_r"].head.y + 0.065 * scale, 0)), Vector((edit_bones["foot_r"].tail.x, edit_bones["foot_r"].tail.y + 0.065 * scale, 0)), 0))),
-        ("ik_foot_target_r", "ik_foot_roll_back_r", LazyInit(lambda: (edit_bones["foot_r"].head, edit_bones["foot_r"].tail, edit_bones["foot_r"].roll))),
-        ("ik_foot_pole_r", "tasty_root", LazyInit(lambda: (edit_bones["calf_r"].head + Vector((0, -0.75, 0)) * scale, edit_bones["calf_r"].head + Vector((0, -0.75, -0.2)) * scale, 0))),
+        ("ik_foot_parent_r", "tasty_root", "foot_r", lambda bone: (bone.head, bone.tail, bone.roll)),
+        ("ik_foot_ctrl_r", "ik_foot_parent_r", "ball_r", lambda bone: (bone.head + foot_ctrl_offset, bone.tail + foot_ctrl_offset, 0)),
+        ("ik_foot_roll_inner_r", "ik_foot_parent_r", "ball_r", lambda bone: (Vector((bone.head.x + foot_roll_offset, bone.head.y, 0)), Vector((bone.tail.x + foot_roll_offset, bone.tail.y, 0)), 0)),
+        ("ik_foot_roll_outer_r", "ik_foot_roll_inner_r", "ball_r", lambda bone: (Vector((bone.head.x - foot_roll_offset, bone.head.y, 0)), Vector((bone.tail.x - foot_roll_offset, bone.tail.y, 0)), 0)),
+        ("ik_foot_roll_front_r", "ik_foot_roll_outer_r", "ball_r", lambda bone: (bone.head, bone.tail, pi)),
+        ("ik_foot_roll_back_r", "ik_foot_roll_front_r", "foot_r", lambda bone: (Vector((bone.head.x, bone.head.y + foot_roll_back_offset, 0)), Vector((bone.tail.x, bone.tail.y + foot_roll_back_offset, 0)), 0)),
+        ("ik_foot_target_r", "ik_foot_roll_back_r", "foot_r", lambda bone: (bone.head, bone.tail, bone.roll)),
+        ("ik_foot_pole_r", "tasty_root", "calf_r", lambda bone: (bone.head + foot_pole_head_offset, bone.head + foot_pole_tail_offset, 0)),
         
-        ("ik_foot_parent_l", "tasty_root", LazyInit(lambda: (edit_bones["foot_l"].head, edit_bones["foot_l"].tail, edit_bones["foot_l"].roll))),
-        ("ik_foot_ctrl_l", "ik_foot_parent_l", LazyInit(lambda: (edit_bones["ball_l"].head + Vector((0, 0.2, 0)) * scale, edit_bones["ball_l"].tail + Vector((0, 0.2, 0)) * scale, 0))),
-        ("ik_foot_roll_inner_l", "ik_foot_parent_l", LazyInit(lambda: (Vector((edit_bones["ball_l"].head.x - 0.04 * scale, edit_bones["ball_l"].head.y, 0)), Vector((edit_bones["ball_l"].tail.x - 0.04 * scale, edit_bones["ball_l"].tail.y, 0)), 0))),
-        ("ik_foot_roll_outer_l", "ik_foot_roll_inner_l", LazyInit(lambda: (Vector((edit_bones["ball_l"].head.x + 0.04 * scale, edit_bones["ball_l"].head.y, 0)), Vector((edit_bones["ball_l"].tail.x + 0.04 * scale, edit_bones["ball_l"].tail.y, 0)), 0))),
-        ("ik_foot_roll_front_l", "ik_foot_roll_outer_l", LazyInit(lambda: (edit_bones["ball_l"].head, edit_bones["ball_l"].tail, radians(180)))),
-        ("ik_foot_roll_back_l", "ik_foot_roll_front_l", LazyInit(lambda: (Vector((edit_bones["foot_l"].head.x, edit_bones["foot_l"].head.y + 0.065 * scale, 0)), Vector((edit_bones["foot_l"].tail.x, edit_bones["foot_l"].tail.y + 0.065 * scale, 0)), 0))),
-        ("ik_foot_target_l", "ik_foot_roll_back_l", LazyInit(lambda: (edit_bones["foot_l"].head, edit_bones["foot_l"].tail, edit_bones["foot_l"].roll))),
-        ("ik_foot_pole_l", "tasty_root", LazyInit(lambda: (edit_bones["calf_l"].head + Vector((0, -0.75, 0)) * scale, edit_bones["calf_l"].head + Vector((0, -0.75, -0.2)) * scale, 0))),
-
-        ("ik_hand_parent_r", "tasty_root", LazyInit(lambda: (edit_bones["hand_r"].head, edit_bones["hand_r"].tail, edit_bones["hand_r"].roll))),
-        ("ik_hand_target_r", "ik_hand_parent_r", LazyInit(lambda: (edit_bones["hand_r"].head, edit_bones["hand_r"].tail, edit_bones["hand_r"].roll))),
-        ("ik_finger_thumb_r", "ik_hand_parent_r", LazyInit(lambda: (edit_bones["thumb_03_r"].tail, 2 * edit_bones["thumb_03_r"].tail - edit_bones["thumb_03_r"].head, edit_bones["thumb_03_r"].roll))),
-        ("ik_finger_index_r", "ik_hand_parent_r", LazyInit(lambda: (edit_bones["index_03_r"].tail, 2 * edit_bones["index_03_r"].tail - edit_bones["index_03_r"].head, edit_bones["index_03_r"].roll))),
-        ("ik_finger_middle_r", "ik_hand_parent_r", LazyInit(lambda: (edit_bones["middle_03_r"].tail, 2 * edit_bones["middle_03_r"].tail - edit_bones["middle_03_r"].head, edit_bones["middle_03_r"].roll))),
-        ("ik_finger_ring_r", "ik_hand_parent_r", LazyInit(lambda: (edit_bones["ring_03_r"].tail, 2 * edit_bones["ring_03_r"].tail - edit_bones["ring_03_r"].head, edit_bones["ring_03_r"].roll))),
-        ("ik_finger_pinky_r", "ik_hand_parent_r", LazyInit(lambda: (edit_bones["pinky_03_r"].tail, 2 * edit_bones["pinky_03_r"].tail - edit_bones["pinky_03_r"].head, edit_bones["pinky_03_r"].roll))),
-        ("ik_hand_pole_r", "tasty_root", LazyInit(lambda: (edit_bones["lowerarm_r"].head + Vector((0, 0.75, 0)) * scale, edit_bones["lowerarm_r"].head + Vector((0, 0.75, -0.2)) * scale, 0))),
+        ("ik_foot_parent_l", "tasty_root", "foot_l", lambda bone: (bone.head, bone.tail, bone.roll)),
+        ("ik_foot_ctrl_l", "ik_foot_parent_l", "ball_l", lambda bone: (bone.head + foot_ctrl_offset, bone.tail + foot_ctrl_offset, 0)),
+        ("ik_foot_roll_inner_l", "ik_foot_parent_l", "ball_l", lambda bone: (Vector((bone.head.x - foot_roll_offset, bone.head.y, 0)), Vector((bone.tail.x - foot_roll_offset, bone.tail.y, 0)), 0)),
+        ("ik_foot_roll_outer_l", "ik_foot_roll_inner_l", "ball_l", lambda bone: (Vector((bone.head.x + foot_roll_offset, bone.head.y, 0)), Vector((bone.tail.x + foot_roll_offset, bone.tail.y, 0)), 0)),
+        ("ik_foot_roll_front_l", "ik_foot_roll_outer_l", "ball_l", lambda bone: (bone.head, bone.tail, pi)),
+        ("ik_foot_roll_back_l", "ik_foot_roll_front_l", "foot_l", lambda bone: (Vector((bone.head.x, bone.head.y + foot_roll_back_offset, 0)), Vector((bone.tail.x, bone.tail.y + foot_roll_back_offset, 0)), 0)),
+        ("ik_foot_target_l", "ik_foot_roll_back_l", "foot_l", lambda bone: (bone.head, bone.tail, bone.roll)),
+        ("ik_foot_pole_l", "tasty_root", "calf_l", lambda bone: (bone.head + foot_pole_head_offset, bone.head + foot_pole_tail_offset, 0)),
+
+        ("ik_hand_parent_r", "tasty_root", "hand_r", lambda bone: (bone.head, bone.tail, bone.roll)),
+        ("ik_hand_target_r", "ik_hand_parent_r", "hand_r", lambda bone: (bone.head, bone.tail, bone.roll)),
+        ("ik_finger_thumb_r", "ik_hand_parent_r", "thumb_03_r", lambda bone: (bone.tail, 2 * bone.tail - bone.head, bone.roll)),
+        ("ik_finger_index_r", "ik_hand_parent_r", "index_03_r", lambda bone: (bone.tail, 2 * bone.tail - bone.head, bone.roll)),
+        ("ik_finger_middle_r", "ik_hand_parent_r", "middle_03_r", lambda bone: (bone.tail, 2 * bone.tail - bone.head, bone.roll)),
+        ("ik_finger_ring_r", "ik_hand_parent_r", "ring_03_r", lambda bone: (bone.tail, 2 * bone.tail - bone.head, bone.roll)),
+        ("ik_finger_pinky_r", "ik_hand_parent_r", "pinky_03_r", lambda bone: (bone.tail, 2 * bone.tail - bone.head, bone.roll)),
+        ("ik_hand_pole_r", "tasty_root", "lowerarm_r", lambda bone: (bone.head + hand_pole_head_offset, bone.head + hand_pole_tail_offset, 0)),
         
-        ("ik_hand_parent_l", "tasty_root", LazyInit(lambda: (edit_bones["hand_l"].head, edit_bones["hand_l"].tail, edit_bones["hand_l"].roll))),
-        ("ik_hand_target_l", "ik_hand_parent_l", LazyInit(lambda: (edit_bones["hand_l"].head, edit_bones["hand_l"].tail, edit_bones["hand_l"].roll))),
-        ("ik_finger_thumb_l", "ik_hand_parent_l", LazyInit(lambda: (edit_bones["thumb_03_l"].tail, 2 * edit_bones["thumb_03_l"].tail - edit_bones["thumb_03_l"].head, edit_bones["thumb_03_l"].roll))),
-        ("ik_finger_index_l", "ik_hand_parent_l", LazyInit(lambda: (edit_bones["index_03_l"].tail, 2 * edit_bones["index_03_l"].tail - edit_bones["index_03_l"].head, edit_bones["index_03_l"].roll))),
-        ("ik_finger_middle_l", "ik_hand_parent_l", LazyInit(lambda: (edit_bones["middle_03_l"].tail, 2 * edit_bones["middle_03_l"].tail - edit_bones["middle_03_l"].head, edit_bones["middle_03_l"].roll))),
-        ("ik_finger_ring_l", "ik_hand_parent_l", LazyInit(lambda: (edit_bones["ring_03_l"].tail, 2 * edit_bones["ring_03_l"].tail - edit_bones["ring_03_l"].head, edit_bones["ring_03_l"].roll))),
-        ("ik_finger_pinky_l", "ik_hand_parent_l", LazyInit(lambda: (edit_bones["pinky_03_l"].tail, 2 * edit_bones["pinky_03_l"].tail - edit_bones["pinky_03_l"].head, edit_bones["pinky_03_l"].roll))),
-        ("ik_hand_pole_l", "tasty_root", LazyInit(lambda: (edit_bones["lowerarm_l"].head + Vector((0, 0.75, 0)) * scale, edit_bones["lowerarm_l"].head + Vector((0, 0.75, -0.2)) * scale, 0))),
-
-        ("index_control_r", "index_metacarpal_r", LazyInit(lambda: (edit_bones["index_01_r"].head, edit_bones["index_01_r"].tail, edit_bones["index_01_r"].roll))),
-        ("middle_control_r", "middle_metacarpal_r", LazyInit(lambda: (edit_bones["middle_01_r"].head, edit_bones["middle_01_r"].tail, edit_bones["middle_01_r"].roll))),
-        ("ring_control_r", "ring_metacarpal_r", LazyInit(lambda: (edit_bones["ring_01_r"].head, edit_bones["ring_01_r"].tail, edit_bones["ring_01_r"].roll))),
-        ("pinky_control_r", "pinky_metacarpal_r",  LazyInit(lambda: (edit_bones["pinky_01_r"].head, edit_bones["pinky_01_r"].tail, edit_bones["pinky_01_r"].roll))),
-
-        ("index_control_l", "index_metacarpal_l", LazyInit(lambda: (edit_bones["index_01_l"].head, edit_bones["index_01_l"].tail, edit_bones["index_01_l"].roll))),
-        ("middle_control_l", "middle_metacarpal_l", LazyInit(lambda: (edit_bones["middle_01_l"].head, edit_bones["middle_01_l"].tail, edit_bones["middle_01_l"].roll))),
-        ("ring_control_l", "ring_metacarpal_l", LazyInit(lambda: (edit_bones["ring_01_l"].head, edit_bones["ring_01_l"].tail, edit_bones["ring_01_l"].roll))),
-        ("pinky_control_l", "pinky_metacarpal_l",  LazyInit(lambda: (edit_bones["pinky_01_l"].head, edit_bones["pinky_01_l"].tail, edit_bones["pinky_01_l"].roll))),
-
-        ("ik_dog_ball_r", "ik_foot_target_r", LazyInit(lambda: (edit_bones["dog_ball_r"].tail, 2 * edit_bones["dog_ball_r"].tail - edit_bones["dog_ball_r"].head, edit_bones["dog_ball_r"].roll))),
-        ("ik_dog_ball_l", "ik_foot_target_l", LazyInit(lambda: (edit_bones["dog_ball_l"].tail, 2 * edit_bones["dog_ball_l"].tail - edit_bones["dog_ball_l"].head, edit_bones["dog_ball_l"].roll))),
-
-        ("ik_wolf_ball_r", "ik_foot_target_r", LazyInit(lambda: (edit_bones["wolf_ball_r"].tail, 2 * edit_bones["wolf_ball_r"].tail - edit_bones["wolf_ball_r"].head, edit_bones["wolf_ball_r"].roll))),
-        ("ik_wolf_ball_l", "ik_foot_target_l", LazyInit(lambda: (edit_bones["wolf_ball_l"].tail, 2 * edit_bones["wolf_ball_l"].tail - edit_bones["wolf_ball_l"].head, edit_bones["wolf_ball_l"].roll))),
-
-        ("eye_control_parent", "tasty_root", LazyInit(lambda: (edit_bones["head"].head + Vector((0, -0.675, 0)) * scale, edit_bones["head"].head + Vector((0, -0.7, 0)) * scale, 0))),
-        ("eye_control_r", "eye_control_parent", LazyInit(lambda: (edit_bones["eye_control_parent"].head - Vector((0.0325, 0, 0)) * scale, edit_bones["eye_control_parent"].tail - Vector((0.0325, 0, 0)) * scale, 0))),
-        ("eye_control_l", "eye_control_parent", LazyInit(lambda: (edit_bones["eye_control_parent"].head + Vector((0.0325, 0, 0)) * scale, edit_bones["eye_control_parent"].tail + Vector((0.0325, 0, 0)) * scale, 0)))
+        ("ik_hand_parent_l", "tasty_root", "hand_l", lambda bone: (bone.head, bone.tail, bone.roll)),
+        ("ik_hand_target_l", "ik_hand_parent_l", "hand_l", lambda bone: (bone.head, bone.tail, bone.roll)),
+        ("ik_finger_thumb_l", "ik_hand_parent_l", "thumb_03_l", lambda bone: (bone.tail, 2 * bone.tail - bone.head, bone.roll)),
+        ("ik_finger_index_l", "ik_hand_parent_l", "index_03_l", lambda bone: (bone.tail, 2 * bone.tail - bone.head, bone.roll)),
+        ("ik_finger_middle_l", "ik_hand_parent_l", "middle_03_l", lambda bone: (bone.tail, 2 * bone.tail - bone.head, bone.roll)),
+        ("ik_finger_ring_l", "ik_hand_parent_l", "ring_03_l", lambda bone: (bone.tail, 2 * bone.tail - bone.head, bone.roll)),
+        ("ik_finger_pinky_l", "ik_hand_parent_l", "pinky_03_l", lambda bone: (bone.tail, 2 * bone.tail - bone.head, bone.roll)),
+        ("ik_hand_pole_l", "tasty_root", "lowerarm_l", lambda bone: (bone.head + hand_pole_head_offset, bone.head + hand_pole_tail_offset, 0)),
+
+        ("index_control_r", "index_metacarpal_r", "index_01_r", lambda bone: (bone.head, bone.tail, bone.roll)),
+        ("middle_control_r", "middle_metacarpal_r", "middle_01_r", lambda bone: (bone.head, bone.tail, bone.roll)),
+        ("ring_control_r", "ring_metacarpal_r", "ring_01_r", lambda bone: (bone.head, bone.tail, bone.roll)),
+        ("pinky_control_r", "pinky_metacarpal_r", "pinky_01_r", lambda bone: (bone.head, bone.tail, bone.roll)),
+
+        ("index_control_l", "index_metacarpal_l", "index_01_l", lambda bone: (bone.head, bone.tail, bone.roll)),
+        ("middle_control_l", "middle_metacarpal_l", "middle_01_l", lambda bone: (bone.head, bone.tail, bone.roll)),
+        ("ring_control_l", "ring_metacarpal_l", "ring_01_l", lambda bone: (bone.head, bone.tail, bone.roll)),
+        ("pinky_control_l", "pinky_metacarpal_l", "pinky_01_l", lambda bone: (bone.head, bone.tail, bone.roll)),
+
+        ("ik_dog_ball_r", "ik_foot_target_r", "dog_ball_r", lambda bone: (bone.tail, 2 * bone.tail - bone.head, bone.roll)),
+        ("ik_dog_ball_l", "ik_foot_target_l", "dog_ball_l", lambda bone: (bone.tail, 2 * bone.tail - bone.head, bone.roll)),
+
+        ("ik_wolf_ball_r", "ik_foot_target_r", "wolf_ball_r", lambda bone: (bone.tail, 2 * bone.tail - bone.head, bone.roll)),
+        ("ik_wolf_ball_l", "ik_foot_target_l", "wolf_ball_l", lambda bone: (bone.tail, 2 * bone.tail - bone.head, bone.roll)),
+
+        ("eye_control_parent", "tasty_root", "head", lambda bone: (bone.head + eye_control_parent_head_offset, bone.head + eye_control_parent_tail_offset, 0)),
+        ("eye_control_r", "eye_control_parent", "eye_control_parent", lambda bone: (bone.head - eye_control_offset, bone.tail - eye_control_offset, 0)),
+        ("eye_control_l", "eye_control_parent", "eye_control_parent", lambda bone: (bone.head + eye_control_offset, bone.tail + eye_control_offset, 0))
     ]
 
-    for bone_name, parent_name, data in new_bones:
-        if not data.load(): continue
+    for bone_name, parent_name, source_name, transform in new_bones:
+        if not (source_bone := bones_by_name.get(source_name)): continue
 
-        bone = edit_bones.get(bone_name) or edit_bones.new(bone_name)
-        bone.parent = edit_bones.get(parent_name)
+        head, tail, roll = transform(source_bone)
+
+        if (bone := bones_by_name.get(bone_name)) is None:
+            bone = bones_by_name[bone_name] = edit_bones.new(bone_name)
+        bone.parent = bones_by_name.get(parent_name)
 
-        head, tail, roll = data.get()
         bone.head = head
         bone.tail = tail
         bone.roll = roll
@@ -1650,53 +2061,63 @@ def apply_tasty_rig(master_skeleton, scale, use_finger_ik = True, use_dyn_bone_s
     ]
 
     for name, parent in parent_adjustment_bones:
-        if not (bone := edit_bones.get(name)): continue
-        if not (parent_bone := edit_bones.get(parent)): continue
+        if not (bone := bones_by_name.get(name)): continue
+        if not (parent_bone := bones_by_name.get(parent)): continue
 
         bone.parent = parent_bone
 
     head_adjustment_bones = [
-        ("calf_r", LazyInit(lambda: edit_bones["calf_r"].head + Vector((0.0075, 0, 0)))),
-        ("calf_l", LazyInit(lambda: edit_bones["calf_l"].head - Vector((0.0075, 0, 0)))),
-        ("R_eye_lid_upper_mid", LazyInit(lambda: edit_bones["R_eye"].head)),
-        ("R_eye_lid_lower_mid", LazyInit(lambda: edit_bones["R_eye"].head)),
-        ("L_eye_lid_upper_mid", LazyInit(lambda: edit_bones["L_eye"].head)),
-        ("L_eye_lid_lower_mid", LazyInit(lambda: edit_bones["L_eye"].head)),
+        ("calf_r", "calf_r", lambda bone: bone.head + calf_head_offset),
+        ("calf_l", "calf_l", lambda bone: bone.head - calf_head_offset),
+        ("R_eye_lid_upper_mid", "R_eye", lambda bone: bone.head),
+        ("R_eye_lid_lower_mid", "R_eye", lambda bone: bone.head),
+        ("L_eye_lid_upper_mid", "L_eye", lambda bone: bone.head),
+        ("L_eye_lid_lower_mid", "L_eye", lambda bone: bone.head),
     ]
 
-    for name, data in head_adjustment_bones:
-        if not data.load(): continue
-        if not (bone := edit_bones.get(name)): continue
+    for name, source_name, get_head in head_adjustment_bones:
+        if not (source_bone := bones_by_name.get(source_name)): continue
+        if not (bone := bones_by_name.get(name)): continue
 
-        bone.head = data.get()
+        bone.head = get_head(source_bone)
         
     tail_adjustment_bones = [
-        ("calf_r", LazyInit(lambda: edit_bones["ik_foot_target_r"].head)),
-        ("calf_l", LazyInit(lambda: edit_bones["ik_foot_target_l"].head)),
-        ("lowerarm_r", LazyInit(lambda: edit_bones["ik_hand_target_r"].head)),
-        ("lowerarm_l", LazyInit(lambda: edit_bones["ik_hand_target_l"].head)),
-        ("R_eye", LazyInit(lambda: edit_bones["R_eye"].head - Vector((0, 0.1, 0)) * scale)),
-        ("L_eye", LazyInit(lambda: edit_bones["L_eye"].head - Vector((0, 0.1, 0)) * scale)),
-        ("FACIAL_R_Eye", LazyInit(lambda: edit_bones["FACIAL_R_Eye"].head - Vector((0, 0.1, 0)) * scale)),
-        ("FACIAL_L_Eye", LazyInit(lambda: edit_bones["FACIAL_L_Eye"].head - Vector((0, 0.1, 0)) * scale)),
-        ("C_jaw", LazyInit(lambda: edit_bones["C_jaw"].head + Vector((0, -0.1, 0)) * scale)),
-
-        ("pelvis", LazyInit(lambda: edit_bones["pelvis"].head + Vector((0, 0, 0.15)) * scale)),
-        ("spine_01", LazyInit(lambda: edit_bones["spine_01"].head + Vector((0, 0, edit_bones["spine_01"].length)))),
-        ("spine_02", LazyInit(lambda: edit_bones["spine_02"].head + Vector((0, 0, edit_bones["spine_02"].length)))),
-        ("spine_03", LazyInit(lambda: edit_bones["spine_03"].head + Vector((0, 0, edit_bones["spine_03"].length)))),
-        ("spine_04", LazyInit(lambda: edit_bones["spine_04"].head + Vector((0, 0, edit_bones["spine_04"].length)))),
-        ("spine_05", LazyInit(lambda: edit_bones["spine_05"].head + Vector((0, 0, edit_bones["spine_05"].length)))),
-        ("neck_01", LazyInit(lambda: edit_bones["neck_01"].head + Vector((0, 0, edit_bones["neck_01"].length)))),
-        ("neck_02", LazyInit(lambda: edit_bones["neck_02"].head + Vector((0, 0, edit_bones["neck_02"].length)))),
-        ("head", LazyInit(lambda: edit_bones["head"].head + Vector((0, 0, edit_bones["head"].length)))),
+        ("calf_r", "ik_foot_target_r", lambda bone: bone.head),
+        ("calf_l", "ik_foot_target_l", lambda bone: bone.head),
+        ("lowerarm_r", "ik_hand_target_r", lambda bone: bone.head),
+        ("lowerarm_l", "ik_hand_target_l", lambda bone: bone.head),
+        ("R_eye", "R_eye", lambda bone: bone.head - face_tail_offset),
+        ("L_eye", "L_eye", lambda bone: bone.head - face_tail_offset),
+        ("FACIAL_R_Eye", "FACIAL_R_Eye", lambda bone: bone.head - face_tail_offset),
+        ("FACIAL_L_Eye", "FACIAL_L_Eye", lambda bone: bone.head - face_tail_offset),
+        ("C_jaw", "C_jaw", lambda bone: bone.head - face_tail_offset),
     ]
     
-    for name, data in tail_adjustment_bones:
-        if not data.load(): continue
-        if not (bone := edit_bones.get(name)): continue
+    for name, source_name, get_tail in tail_adjustment_bones:
+        if not (source_bone := bones_by_name.get(source_name)): continue
+        if not (bone := bones_by_name.get(name)): continue
         
-        bone.tail = data.get()
+        bone.tail = get_tail(source_bone)
+
+    # point straight up, None keeps the bone's current length
+    vertical_tail_bones = [
+        ("pelvis", 0.15 * scale),
+        ("spine_01", None),
+        ("spine_02", None),
+        ("spine_03", None),
+        ("spine_04", None),
+        ("spine_05", None),
+        ("neck_01", None),
+        ("neck_02", None),
+        ("head", None),
+    ]
+
+    for name, length in vertical_tail_bones:
+        if not (bone := bones_by_name.get(name)): continue
+
+        tail = bone.head.copy()
+        tail.z += bone.length if length is None else length
+        bone.tail = tail
 
     roll_adjustment_bones = [
         ("ball_r", 0),
@@ -1705,213 +2126,110 @@ def apply_tasty_rig(master_skeleton, scale, use_finger_ik = True, use_dyn_bone_s
     ]
 
     for name, roll in roll_adjustment_bones:
-        if not (bone := edit_bones.get(name)): continue
+        if not (bone := bones_by_name.get(name)): continue
 
         bone.roll = roll
 
     transform_adjustment_bones = [
-        ("index_control_r", Vector((0.025, 0.0, 0.0))),
-        ("middle_control_r", Vector((0.025, 0.0, 0.0))),
-        ("ring_control_r", Vector((0.025, 0.0, 0.0))),
-        ("pinky_control_r", Vector((0.025, 0.0, 0.0))),
-
-        ("index_control_l", Vector((0.025, 0.0, 0.0))),
-        ("middle_control_l", Vector((0.025, 0.0, 0.0))),
-        ("ring_control_l", Vector((0.025, 0.0, 0.0))),
-        ("pinky_control_l", Vector((0.025, 0.0, 0.0))),
+        ("index_control_r", finger_control_translation),
+        ("middle_control_r", finger_control_translation),
+        ("ring_control_r", finger_control_translation),
+        ("pinky_control_r", finger_control_translation),
+
+        ("index_control_l", finger_control_translation),
+        ("middle_control_l", finger_control_translation),
+        ("ring_control_l", finger_control_translation),
+        ("pinky_control_l", finger_control_translation),
     ]
 
     for name, transform in transform_adjustment_bones:
-        if not (bone := edit_bones.get(name)): continue
+        if not (bone := bones_by_name.get(name)): continue
 
-        bone.matrix @= Matrix.Translation(transform)
+        bone.matrix @= transform
 
-    if (lower_lip_bone := edit_bones.get("FACIAL_C_LowerLipRotation")) and (jaw_bone := edit_bones.get("FACIAL_C_Jaw")):
+    if (lower_lip_bone := bones_by_name.get("FACIAL_C_LowerLipRotation")) and (jaw_bone := bones_by_name.get("FACIAL_C_Jaw")):
         lower_lip_bone.parent = jaw_bone
         
-    bpy.ops.object.mode_set(mode='POSE')
+    # leaving edit mode rebuilds the pose, everything below goes through the data api in object mode
+    bpy.ops.object.mode_set(mode='OBJECT')
     
     pose_bones = master_skeleton.pose.bones
+    get_pose_bone = pose_bones.get
     
-    bone_shapes = [
-        ("root", "RIG_Root", 0.75, Euler((radians(90), 0, 0))),
-        ("pelvis", "RIG_Torso", 1.5, Euler((0, radians(-90), 0))),
-        ("spine_01", "RIG_Hips", 2.2),
-        ("spine_02", "RIG_Hips", 1.8),
-        ("spine_03", "RIG_Hips", 1.6),
-        ("spine_04", "RIG_Hips", 1.2),
-        ("spine_05", "RIG_Hips", 1.6),
-        ("neck_01", "RIG_Hips", 2.0),
-        ("neck_02", "RIG_Hips", 1.4),
-        ("head", "RIG_Hips", 2.6),
-
-        ('clavicle_r', 'RIG_Shoulder', 1.0),
-        ('clavicle_l', 'RIG_Shoulder', 1.0),
-
-        ('upperarm_twist_01_r', 'RIG_Forearm', 0.13, False),
-        ('upperarm_twist_02_r', 'RIG_Forearm', 0.10, False),
-        ('lowerarm_twist_01_r', 'RIG_Forearm', 0.13, False),
-        ('lowerarm_twist_02_r', 'RIG_Forearm', 0.13, False),
-        ('upperarm_twist_01_l', 'RIG_Forearm', 0.13, False),
-        ('upperarm_twist_02_l', 'RIG_Forearm', 0.10, False),
-        ('lowerarm_twist_01_l', 'RIG_Forearm', 0.13, False),
-        ('lowerarm_twist_02_l', 'RIG_Forearm', 0.13, False),
-
-        ('thigh_twist_01_r', 'RIG_Tweak', 0.15, False),
-        ('calf_twist_01_r', 'RIG_Tweak', 0.13, False),
-        ('calf_twist_02_r', 'RIG_Tweak', 0.2, False),
-        ('thigh_twist_01_l', 'RIG_Tweak', 0.15, False),
-        ('calf_twist_01_l', 'RIG_Tweak', 0.13, False),
-        ('calf_twist_02_l', 'RIG_Tweak', 0.2, False),
-
-        ("ik_foot_parent_r", "RIG_FootR", 1.0),
-        ("ik_foot_parent_l", "RIG_FootL", 1.0, Euler((0, radians(-90), 0))),
-        ("ik_foot_pole_r", "RIG_Tweak", 0.75),
-        ("ik_foot_pole_l", "RIG_Tweak", 0.75),
-        ("ik_foot_ctrl_r", "RIG_Ctrl", 7.5, Euler((radians(90), 0, 0))),
-        ("ik_foot_ctrl_l", "RIG_Ctrl", 7.5, Euler((radians(90), 0, 0))),
-
-        ("ik_hand_parent_r", "RIG_Hand", 2.2),
-        ("ik_hand_target_r", "RIG_Ctrl", 7.5, Euler((0, radians(-90), 0))),
-        ("ik_hand_pole_r", "RIG_Tweak", 0.75),
-        ("ik_finger_thumb_r", "RIG_Finger", 1.0, Euler((0, 0, radians(180)))),
-        ("ik_finger_index_r", "RIG_Finger", 1.0, Euler((0, 0, radians(180)))),
-        ("ik_finger_middle_r", "RIG_Finger", 1.0, Euler((0, 0, radians(180)))),
-        ("ik_finger_ring_r", "RIG_Finger", 1.0, Euler((0, 0, radians(180)))),
-        ("ik_finger_pinky_r", "RIG_Finger", 1.0, Euler((0, 0, radians(180)))),
-
-        ("ik_hand_parent_l", "RIG_Hand", 2.2),
-        ("ik_hand_target_l", "RIG_Ctrl", 7.5, Euler((0, radians(-90), 0))),
-        ("ik_hand_pole_l", "RIG_Tweak", 0.75),
-        ("ik_finger_thumb_l", "RIG_Finger", 1.0, Euler((0, 0, radians(180)))),
-        ("ik_finger_index_l", "RIG_Finger", 1.0, Euler((0, 0, radians(180)))),
-        ("ik_finger_middle_l", "RIG_Finger", 1.0, Euler((0, 0, radians(180)))),
-        ("ik_finger_ring_l", "RIG_Finger", 1.0, Euler((0, 0, radians(180)))),
-        ("ik_finger_pinky_l", "RIG_Finger", 1.0, Euler((0, 0, radians(180)))),
-
-        ("index_control_r", "RIG_FingerRotR", 1.0),
-        ("middle_control_r", "RIG_FingerRotR", 1.0),
-        ("ring_control_r", "RIG_FingerRotR", 1.0),
-        ("pinky_control_r", "RIG_FingerRotR", 1.0),
-
-        ("index_control_l", "RIG_FingerRotR", 1.0),
-        ("middle_control_l", "RIG_FingerRotR", 1.0),
-        ("ring_control_l", "RIG_FingerRotR", 1.0),
-        ("pinky_control_l", "RIG_FingerRotR", 1.0),
-        
-        ("eye_control_parent", "RIG_EyeTrackMid", 0.75, False),
-        ("eye_control_r", "RIG_EyeTrackInd", 0.75, False),
-        ("eye_control_l", "RIG_EyeTrackInd", 0.75, False),
-        
-        ("C_jaw", "RIG_JawBone", 0.1, False),
-        ("FACIAL_C_Jaw", "RIG_JawBone", 0.1, False),
-    ]
-    
-    for bone_name, shape_name, shape_scale, *extra in bone_shapes:
-        if not (bone := pose_bones.get(bone_name)): continue
-        if not (shape := bpy.data.objects.get(shape_name)): continue
+    shapes = {shape_name: bpy.data.objects.get(shape_name) for shape_name in TASTY_SHAPE_NAMES}
+
+    for bone_name, shape_name, shape_scale, *extra in TASTY_BONE_SHAPES:
+        if not (bone := get_pose_bone(bone_name)): continue
+        if not (shape := shapes[shape_name]): continue
         
         bone.custom_shape = shape
-        bone.custom_shape_scale_xyz = (shape_scale, shape_scale, shape_scale)
-        #bone.custom_shape_scale_xyz *= scale
         
         for extra_item in extra:
             if type(extra_item) is Euler:
                 bone.custom_shape_rotation_euler = extra_item
             else:
                 bone.use_custom_shape_bone_size = extra_item
-                bone.custom_shape_scale_xyz *= scale
-
-
-    explicit_collection_bones = {
-        "pelvis": main_collection,
-        "spine_01": main_collection,
-        "spine_02": main_collection,
-        "spine_03": main_collection,
-        "spine_04": main_collection,
-        "spine_05": main_collection,
-        "clavicle_r": main_collection,
-        "clavicle_l": main_collection,
-        "neck_01": main_collection,
-        "neck_02": main_collection,
-        "head": main_collection,
-        "ik_foot_parent_r": ik_collection,
-        "ik_foot_parent_l": ik_collection,
-        "ik_foot_ctrl_r": ik_collection,
-        "ik_foot_ctrl_l": ik_collection,
-        "ik_foot_pole_r": ik_collection,
-        "ik_foot_pole_l": ik_collection,
-
-        "ik_hand_parent_r": ik_collection,
-        "ik_hand_target_r": ik_collection,
-        "ik_hand_pole_r": ik_collection,
-        "ik_finger_thumb_r": ik_collection,
-        "ik_finger_index_r": ik_collection,
-        "ik_finger_middle_r": ik_collection,
-        "ik_finger_ring_r": ik_collection,
-        "ik_finger_pinky_r": ik_collection,
-
-        "ik_hand_parent_l": ik_collection,
-        "ik_hand_target_l": ik_collection,
-        "ik_hand_pole_l": ik_collection,
-        "ik_finger_thumb_l": ik_collection,
-        "ik_finger_index_l": ik_collection,
-        "ik_finger_middle_l": ik_collection,
-        "ik_finger_ring_l": ik_collection,
-        "ik_finger_pinky_l": ik_collection,
-
-        "index_control_r": ik_collection,
-        "middle_control_r": ik_collection,
-        "ring_control_r": ik_collection,
-        "pinky_control_r": ik_collection,
-        
-        "index_control_l": ik_collection,
-        "middle_control_l": ik_collection,
-        "ring_control_l": ik_collection,
-        "pinky_control_l": ik_collection,
-        
-        "eye_control_parent": face_collection,
-        "eye_control_r": face_collection,
-        "eye_control_l": face_collection,
+                shape_scale *= scale
+
+        bone.custom_shape_scale_xyz = (shape_scale, shape_scale, shape_scale)
+
+
+    collections_by_key = {
+        "main": main_collection,
+        "ik": ik_collection,
+        "face": face_collection,
     }
 
-    face_root_bones = ["faceAttach", "FACIAL_C_FacialRoot"]
+    # assigned bones are skipped by the collection check below
+    for bone_name, collection_key in TASTY_EXPLICIT_COLLECTIONS.items():
+        if not (bone := get_pose_bone(bone_name)): continue
+        if bone.bone.collections: continue
+
+        collections_by_key[collection_key].assign(bone)
+
+    dynamic_shape = shapes["RIG_Dynamic"]
+    tweak_shape = shapes["RIG_Tweak"]
+    face_shape = shapes["RIG_FaceBone"]
+    deform_shape_scale = (0.030 * scale,) * 3
+
+    # one walk down from each face root instead of a parent walk per bone
+    data_bones = master_skeleton.data.bones
+    face_bone_names = {child.name for root_name in TASTY_FACE_ROOT_BONES if (root_bone := data_bones.get(root_name)) for child in root_bone.children_recursive}
+
     for bone in pose_bones:
-        if len(bone.bone.collections) > 0:
-            continue
-        
-        if explicit_collection := explicit_collection_bones.get(bone.name):
-            explicit_collection.assign(bone)
+        if bone.bone.collections:
             continue
 
-        if bone.name == "root":
+        name = bone.name
+        if name == "root":
             bone.use_custom_shape_bone_size = False
             bone.custom_shape_scale_xyz *= scale
             bone.color.palette = "THEME01"
             continue
 
-        if "dyn_" in bone.name:
+        if "dyn_" in name:
             dyn_collection.assign(bone)
             if use_dyn_bone_shape:
-                bone.custom_shape = bpy.data.objects.get("RIG_Dynamic")
+                bone.custom_shape = dynamic_shape
             continue
             
-        if "twist_" in bone.name:
+        if "twist_" in name:
             deform_collection.assign(bone)
             bone.use_custom_shape_bone_size = False
             continue
 
-        if "deform_" in bone.name:
+        if "deform_" in name:
             deform_collection.assign(bone)
-            bone.custom_shape = bpy.data.objects.get('RIG_Tweak')
-            bone.custom_shape_scale_xyz = (0.030, 0.030, 0.030) * scale
+            bone.custom_shape = tweak_shape
+            bone.custom_shape_scale_xyz = deform_shape_scale
             bone.use_custom_shape_bone_size = False
             continue
             
-        if any(bone.bone.parent_recursive, lambda parent: parent.name in face_root_bones):
+        if name in face_bone_names:
             face_collection.assign(bone)
-            if not any(["eyelid", "eye_lid"], lambda filter: filter in bone.name.casefold()) and bone.custom_shape is None:
-                bone.custom_shape = bpy.data.objects.get("RIG_FaceBone")
+            folded_name = name.casefold()
+            if not any(tag in folded_name for tag in TASTY_EYELID_TAGS) and bone.custom_shape is None:
+                bone.custom_shape = face_shape
             continue
             
 
@@ -1926,153 +2244,47 @@ def apply_tasty_rig(master_skeleton, scale, use_finger_ik = True, use_dyn_bone_s
         face_collection: "THEME06",
     }
     
-    for collection, palette in collection_colors.items():
-        for bone in collection.bones:
-            pose_bones[bone.name].color.palette = palette
+    palette_by_name = {bone.name: palette for collection, palette in collection_colors.items() for bone in collection.bones}
+    for bone in pose_bones:
+        if not (palette := palette_by_name.get(bone.name)): continue
+        bone.color.palette = palette
             
     def add_foot_ik_constraints(suffix):
+        skeleton = master_skeleton
         is_left = suffix == "l"
         ctrl_bone_name = f"ik_foot_ctrl_{suffix}"
 
-        if inner_roll_bone := pose_bones.get(f"ik_foot_roll_inner_{suffix}"):
-            copy_rotation = inner_roll_bone.constraints.new("COPY_ROTATION")
-            copy_rotation.target = master_skeleton
-            copy_rotation.subtarget = ctrl_bone_name
-            copy_rotation.use_x = False
-            copy_rotation.use_y = True
-            copy_rotation.use_z = False
-            copy_rotation.target_space = "LOCAL"
-            copy_rotation.owner_space = "LOCAL"
-
-            limit_rotation = inner_roll_bone.constraints.new("LIMIT_ROTATION")
-            limit_rotation.use_limit_y = True
-            limit_rotation.min_y = radians(-180) if is_left else 0
-            limit_rotation.max_y = 0 if is_left else radians(180)
-            limit_rotation.owner_space = "LOCAL"
+        for bone_prefix, axis, mix_mode, left_limits, right_limits in TASTY_FOOT_ROLL_BONES:
+            if not (roll_bone := get_pose_bone(f"{bone_prefix}_{suffix}")): continue
 
-        if outer_roll_bone := pose_bones.get(f"ik_foot_roll_outer_{suffix}"):
-            copy_rotation = outer_roll_bone.constraints.new("COPY_ROTATION")
-            copy_rotation.target = master_skeleton
-            copy_rotation.subtarget = ctrl_bone_name
-            copy_rotation.use_x = False
-            copy_rotation.use_y = True
-            copy_rotation.use_z = False
-            copy_rotation.target_space = "LOCAL"
-            copy_rotation.owner_space = "LOCAL"
-
-            limit_rotation = outer_roll_bone.constraints.new("LIMIT_ROTATION")
-            limit_rotation.use_limit_y = True
-            limit_rotation.min_y = 0 if is_left else radians(-180)
-            limit_rotation.max_y = radians(180) if is_left else 0
-            limit_rotation.owner_space = "LOCAL"
-
-        if front_roll_bone := pose_bones.get(f"ik_foot_roll_front_{suffix}"):
-            copy_rotation = front_roll_bone.constraints.new("COPY_ROTATION")
-            copy_rotation.target = master_skeleton
-            copy_rotation.subtarget = ctrl_bone_name
-            copy_rotation.use_x = True
-            copy_rotation.use_y = False
-            copy_rotation.use_z = False
-            copy_rotation.invert_x = True
-            copy_rotation.target_space = "LOCAL"
-            copy_rotation.owner_space = "LOCAL"
-
-            limit_rotation = front_roll_bone.constraints.new("LIMIT_ROTATION")
-            limit_rotation.use_limit_x = True
-            limit_rotation.min_x = radians(-180)
-            limit_rotation.max_x = 0
-            limit_rotation.owner_space = "LOCAL"
+            use_x = axis == "x"
+            constraint_bone(roll_bone, "COPY_ROTATION", skeleton, ctrl_bone_name,
+                            use_x=use_x, use_y=not use_x, use_z=False, invert_x=use_x, mix_mode=mix_mode, target_space="LOCAL", owner_space="LOCAL")
 
-        if back_roll_bone := pose_bones.get(f"ik_foot_roll_back_{suffix}"):
-            copy_rotation = back_roll_bone.constraints.new("COPY_ROTATION")
-            copy_rotation.target = master_skeleton
-            copy_rotation.subtarget = ctrl_bone_name
-            copy_rotation.use_x = True
-            copy_rotation.use_y = False
-            copy_rotation.use_z = False
-            copy_rotation.invert_x = True
-            copy_rotation.target_space = "LOCAL"
-            copy_rotation.owner_space = "LOCAL"
-
-            limit_rotation = back_roll_bone.constraints.new("LIMIT_ROTATION")
-            limit_rotation.use_limit_x = True
-            limit_rotation.min_x = 0
-            limit_rotation.max_x = radians(180)
-            limit_rotation.owner_space = "LOCAL"
-
-        if ball_bone := pose_bones.get(f"ball_{suffix}"):
-            copy_rotation = ball_bone.constraints.new("COPY_ROTATION")
-            copy_rotation.target = master_skeleton
-            copy_rotation.subtarget = ctrl_bone_name
-            copy_rotation.use_x = True
-            copy_rotation.use_y = False
-            copy_rotation.use_z = False
-            copy_rotation.invert_x = True
-            copy_rotation.mix_mode = "ADD"
-            copy_rotation.target_space = "LOCAL"
-            copy_rotation.owner_space = "LOCAL"
-
-            limit_rotation = ball_bone.constraints.new("LIMIT_ROTATION")
-            limit_rotation.use_limit_x = True
-            limit_rotation.min_x = radians(-180)
-            limit_rotation.max_x = 0
+            min_limit, max_limit = left_limits if is_left else right_limits
+            limit_rotation = roll_bone.constraints.new("LIMIT_ROTATION")
+            setattr(limit_rotation, f"use_limit_{axis}", True)
+            setattr(limit_rotation, f"min_{axis}", min_limit)
+            setattr(limit_rotation, f"max_{axis}", max_limit)
             limit_rotation.owner_space = "LOCAL"
 
     add_foot_ik_constraints("r")
     add_foot_ik_constraints("l")
 
-    ik_bones = [
-        ("calf_r", "ik_foot_target_r", "ik_foot_pole_r", 2, False, True),
-        ("calf_l", "ik_foot_target_l", "ik_foot_pole_l", 2, False, True),
+    pole_angle = pi
+    for bone_name, target_name, pole_name, chain_length, use_rotation, is_finger in TASTY_IK_BONES:
+        if is_finger and not use_finger_ik: continue
+        if not (bone := get_pose_bone(bone_name)): continue
         
-        ("lowerarm_r", "ik_hand_target_r", "ik_hand_pole_r", 2, False, True),
-        ("thumb_03_r", "ik_finger_thumb_r", None, 3, True, use_finger_ik),
-        ("index_03_r", "ik_finger_index_r", None, 4, True, use_finger_ik),
-        ("middle_03_r", "ik_finger_middle_r", None, 4, True, use_finger_ik),
-        ("ring_03_r", "ik_finger_ring_r", None, 4, True, use_finger_ik),
-        ("pinky_03_r", "ik_finger_pinky_r", None, 4, True, use_finger_ik),
-        ("phantom_thumb_03_r", "ik_finger_thumb_r", None, 3, True, use_finger_ik),
-        ("phantom_index_03_r", "ik_finger_index_r", None, 4, True, use_finger_ik),
-        ("phantom_middle_03_r", "ik_finger_middle_r", None, 4, True, use_finger_ik),
-        ("phantom_ring_03_r", "ik_finger_ring_r", None, 4, True, use_finger_ik),
-        ("phantom_pinky_03_r", "ik_finger_pinky_r", None, 4, True, use_finger_ik),
-
-        ("lowerarm_l", "ik_hand_target_l", "ik_hand_pole_l", 2, False, True),
-        ("thumb_03_l", "ik_finger_thumb_l", None, 3, True, use_finger_ik),
-        ("index_03_l", "ik_finger_index_l", None, 4, True, use_finger_ik),
-        ("middle_03_l", "ik_finger_middle_l", None, 4, True, use_finger_ik),
-        ("ring_03_l", "ik_finger_ring_l", None, 4, True, use_finger_ik),
-        ("pinky_03_l", "ik_finger_pinky_l", None, 4, True, use_finger_ik),
-        ("phantom_thumb_03_l", "ik_finger_thumb_l", None, 3, True, use_finger_ik),
-        ("phantom_index_03_l", "ik_finger_index_l", None, 4, True, use_finger_ik),
-        ("phantom_middle_03_l", "ik_finger_middle_l", None, 4, True, use_finger_ik),
-        ("phantom_ring_03_l", "ik_finger_ring_l", None, 4, True, use_finger_ik),
-        ("phantom_pinky_03_l", "ik_finger_pinky_l", None, 4, True, use_finger_ik),
-
-        ("dog_ball_r", "ik_dog_ball_r", "ik_foot_pole_r", 3, True, True),
-        ("dog_ball_l", "ik_dog_ball_l", "ik_foot_pole_l", 3, True, True),
-        ("wolf_ball_r", "ik_wolf_ball_r", "ik_foot_pole_r", 3, True, True),
-        ("wolf_ball_l", "ik_wolf_ball_l", "ik_foot_pole_l", 3, True, True),
-    ]
-    
-    for bone_name, target_name, pole_name, chain_length, use_rotation, is_allowed in ik_bones:
-        if not (bone := pose_bones.get(bone_name)): continue
-
-        if not is_allowed:
-            continue
-        
-        constraint = bone.constraints.new("IK")
-        constraint.target = master_skeleton
-        constraint.subtarget = target_name
-        constraint.chain_count = chain_length
-        constraint.use_rotation = use_rotation
+        constraint = constraint_bone(bone, "IK", master_skeleton, target_name,
+                                     chain_count=chain_length, use_rotation=use_rotation)
         
         if pole_name:
             constraint.pole_target = master_skeleton
             constraint.pole_subtarget = pole_name
-            constraint.pole_angle = radians(180)
+            constraint.pole_angle = pole_angle
 
-    copy_rotation_bones = {
+    copy_rotation_bones = (
         ("foot_r", "ik_foot_target_r", 1.0, "WORLD", "REPLACE", True),
         ("foot_l", "ik_foot_target_l", 1.0, "WORLD", "REPLACE", True),
         ("hand_r", "ik_hand_target_r", 1.0, "WORLD", "REPLACE", True),
@@ -2117,55 +2329,43 @@ def apply_tasty_rig(master_skeleton, scale, use_finger_ik = True, use_dyn_bone_s
         ("ring_03_l", "ring_control_l", 1.0, "LOCAL", "ADD", use_finger_fk),
         ("pinky_01_l", "pinky_control_l", 1.0, "LOCAL", "ADD", use_finger_fk),
         ("pinky_02_l", "pinky_control_l", 1.0, "LOCAL", "ADD", use_finger_fk),
-        ("pinky_03_l", "pinky_control_l", 1.0, "LOCAL", "ADD", use_finger_fk)
-    }
+        ("pinky_03_l", "pinky_control_l", 1.0, "LOCAL", "ADD", use_finger_fk),
+    )
     
     for bone_name, target_name, weight, space, mix, is_allowed in copy_rotation_bones:
-        if not (bone := pose_bones.get(bone_name)): continue
-
-        if not is_allowed:
-            continue
+        if not is_allowed: continue
+        if not (bone := get_pose_bone(bone_name)): continue
         
-        constraint = bone.constraints.new("COPY_ROTATION")
-        constraint.target = master_skeleton
-        constraint.subtarget = target_name
-        constraint.influence = weight
-        constraint.target_space = space
-        constraint.owner_space = space
-        constraint.mix_mode = mix
+        constraint_bone(bone, "COPY_ROTATION", master_skeleton, target_name,
+                        influence=weight, target_space=space, owner_space=space, mix_mode=mix)
 
     track_bones = [
         ("eye_control_parent", "head", 0.285)
     ]
 
     for bone_name, target_name, head_tail in track_bones:
-        if not (bone := pose_bones.get(bone_name)): continue
+        if not (bone := get_pose_bone(bone_name)): continue
 
-        constraint = bone.constraints.new('TRACK_TO')
-        constraint.target = master_skeleton
-        constraint.subtarget = target_name
-        constraint.head_tail = head_tail
-        constraint.track_axis = 'TRACK_NEGATIVE_Y'
-        constraint.up_axis = 'UP_Z'
+        constraint_bone(bone, 'TRACK_TO', master_skeleton, target_name,
+                        head_tail=head_tail, track_axis='TRACK_NEGATIVE_Y', up_axis='UP_Z')
 
+    eye_lock_axes = ("LOCK_X", "LOCK_Z")
     lock_track_bones = [
-        ('R_eye', 'eye_control_r', ["X", "Z"]),
-        ('L_eye', 'eye_control_l', ["X", "Z"]),
-        ('FACIAL_R_Eye', 'eye_control_r', ["X", "Z"]),
-        ('FACIAL_L_Eye', 'eye_control_l', ["X", "Z"]),
+        ('R_eye', 'eye_control_r', eye_lock_axes),
+        ('L_eye', 'eye_control_l', eye_lock_axes),
+        ('FACIAL_R_Eye', 'eye_control_r', eye_lock_axes),
+        ('FACIAL_L_Eye', 'eye_control_l', eye_lock_axes),
     ]
 
-    for bone_name, target_name, target_axis in lock_track_bones:
-        if not (bone := pose_bones.get(bone_name)): continue
+    for bone_name, target_name, lock_axes in lock_track_bones:
+        if not (bone := get_pose_bone(bone_name)): continue
 
-        for axis in target_axis:
-            constraint = bone.constraints.new('LOCKED_TRACK')
-            constraint.target = master_skeleton
-            constraint.subtarget = target_name
-            constraint.track_axis = 'TRACK_Y'
-            constraint.lock_axis = 'LOCK_' + axis
+        for lock_axis in lock_axes:
+            constraint_bone(bone, 'LOCKED_TRACK', master_skeleton, target_name,
+                            track_axis='TRACK_Y', lock_axis=lock_axis)
 
     bones = master_skeleton.data.bones
+    get_bone = bones.get
         
     inherit_rotation_bones = [
         ("spine_01", False),
@@ -2173,70 +2373,26 @@ def apply_tasty_rig(master_skeleton, scale, use_finger_ik = True, use_dyn_bone_s
     ]
     
     for bone_name, value in inherit_rotation_bones:
-        if not (bone := bones.get(bone_name)): continue
+        if not (bone := get_bone(bone_name)): continue
         
         bone.use_inherit_rotation = value
         
         
-    hide_bones = [
-        "ik_foot_roll_inner_r",
-        "ik_foot_roll_outer_r",
-        "ik_foot_roll_front_r",
-        "ik_foot_roll_back_r",
-        "ik_foot_target_r",
-        "foot_r",
-        "ball_r",
-        "ik_dog_ball_r",
-        "ik_wolf_ball_r",
-
-        "ik_foot_roll_inner_l",
-        "ik_foot_roll_outer_l",
-        "ik_foot_roll_front_l",
-        "ik_foot_roll_back_l",
-        "ik_foot_target_l",
-        "foot_l",
-        "ball_l",
-        "ik_dog_ball_l",
-        "ik_wolf_ball_l",
-
-        "hand_r",
-        "hand_l",
-        
-    ]
-    
-    for bone_name in hide_bones:
-        if not (bone := bones.get(bone_name)): continue
-        bone.hide = True
-
-    conditional_hide_bones = {
-        "ik_finger_thumb_r": use_finger_fk,
-        "ik_finger_index_r": use_finger_fk,
-        "ik_finger_middle_r": use_finger_fk,
-        "ik_finger_ring_r": use_finger_fk,
-        "ik_finger_pinky_r": use_finger_fk,
-    
-        "ik_finger_thumb_l": use_finger_fk,
-        "ik_finger_index_l": use_finger_fk,
-        "ik_finger_middle_l": use_finger_fk,
-        "ik_finger_ring_l": use_finger_fk,
-        "ik_finger_pinky_l": use_finger_fk,
-
-        "index_control_r": use_finger_ik,
-        "middle_control_r": use_finger_ik,
-        "ring_control_r": use_finger_ik,
-        "pinky_control_r": use_finger_ik,
-
-        "index_control_l": use_finger_ik,
-        "middle_control_l": use_finger_ik,
-        "ring_control_l": use_finger_ik,
-        "pinky_control_l": use_finger_ik,
-        
-        "ik_hand_target_r": use_finger_fk,
-        "ik_hand_target_l": use_finger_fk,
-    }
-
-    for bone_name, condition in conditional_hide_bones.items():
-        if not (bone := bones.get(bone_name)): continue
-        bone.hide = condition
-
-    bpy.ops.object.mode_set(mode='OBJECT')
\ No newline at end of file
+    # gather every hide state first and write them back in one call
+    bone_indices = {bone_name: index for index, bone_name in enumerate(bones.keys())}
+    get_bone_index = bone_indices.get
+    hide_states = np.empty(len(bones), dtype=bool)
+    bones.foreach_get("hide", hide_states)
+
+    for bone_name in TASTY_HIDE_BONES:
+        if (index := get_bone_index(bone_name)) is None: continue
+        hide_states[index] = True
+
+    # finger ik and fk controls are mutually exclusive, hide one set and show the other
+    hidden_controls, shown_controls = (TASTY_FINGER_FK_CONTROLS, TASTY_FINGER_IK_CONTROLS) if use_finger_ik else (TASTY_FINGER_IK_CONTROLS, TASTY_FINGER_FK_CONTROLS)
+    for controls, hide in ((hidden_controls, True), (shown_controls, False)):
+        for bone_name in controls:
+            if (index := get_bone_index(bone_name)) is None: continue
+            hide_states[index] = hide
+
+    bones.foreach_set("hide", hide_states)
\ No newline at end of file
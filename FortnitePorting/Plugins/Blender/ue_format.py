@@ -455,31 +455,51 @@ class UEFormatImport:
 
             # weights
             if len(data.weights) > 0 and len(data.bones) > 0:
+                # one add call per bone and weight value instead of one per vertex
+                grouped_weights = {}
                 for weight in data.weights:
-                    bone_name = data.bones[weight.bone_index].name
-                    vertex_group = mesh_object.vertex_groups.get(bone_name)
-                    if not vertex_group:
-                        vertex_group = mesh_object.vertex_groups.new(name=bone_name)
-                    vertex_group.add([weight.vertex_index], weight.weight, 'ADD')
+                    grouped_weights.setdefault((weight.bone_index, weight.weight), []).append(weight.vertex_index)
+
+                vertex_groups = {}
+                for (bone_index, weight), vertex_indices in grouped_weights.items():
+                    if (vertex_group := vertex_groups.get(bone_index)) is None:
+                        bone_name = data.bones[bone_index].name
+                        vertex_group = mesh_object.vertex_groups.get(bone_name)
+                        if not vertex_group:
+                            vertex_group = mesh_object.vertex_groups.new(name=bone_name)
+                        vertex_groups[bone_index] = vertex_group
+                    vertex_group.add(vertex_indices, weight, 'ADD')
     
             # morph targets
             if len(data.morphs) > 0:
                 default_key = mesh_object.shape_key_add(from_mix=False)
                 default_key.name = "Default"
                 default_key.interpolation = 'KEY_LINEAR'
+
+                base_positions = np.empty(len(mesh_data.vertices) * 3, dtype=np.float32)
+                default_key.data.foreach_get("co", base_positions)
+                base_positions = base_positions.reshape(-1, 3)
     
                 for morph in data.morphs:
                     key = mesh_object.shape_key_add(from_mix=False)
                     key.name = morph.name
                     key.interpolation = 'KEY_LINEAR'
-    
-                    for delta in morph.deltas:
-                        key.data[delta.vertex_index].co += Vector(delta.position)
+
+                    if len(morph.deltas) == 0:
+                        continue
+
+                    # apply every delta at once, add.at keeps repeated vertex indices additive
+                    positions = base_positions.copy()
+                    vertex_indices = np.array([delta.vertex_index for delta in morph.deltas], dtype=np.int32)
+                    delta_positions = np.array([delta.position for delta in morph.deltas], dtype=np.float32)
+                    np.add.at(positions, vertex_indices, delta_positions)
+                    key.data.foreach_set("co", positions.reshape(-1))
             
             squish = lambda array: array.reshape(array.size) # Squish nD array into 1D array (required by foreach_set).
             do_remapping = lambda array, indices: array[indices]
 
-            vertices = [vertex for polygon in mesh_data.polygons for vertex in polygon.vertices]
+            vertices = np.empty(len(mesh_data.loops), dtype=np.int32)
+            mesh_data.loops.foreach_get("vertex_index", vertices)
             # indices = np.array([index for polygon in mesh_data.polygons for index in polygon.loop_indices], dtype=np.int32)
             # assert np.all(indices[:-1] <= indices[1:]) # check if indices are sorted hmm idk
             for color_info in data.colors:
@@ -494,6 +514,7 @@ class UEFormatImport:
 
             # materials
             if len(data.materials) > 0:
+                material_indices = np.zeros(len(mesh_data.polygons), dtype=np.int32)
                 for i, material in enumerate(data.materials):
                     mat = bpy.data.materials.get(material.material_name)
                     if mat is None:
@@ -502,8 +523,8 @@ class UEFormatImport:
     
                     start_face_index = (material.first_index // 3)
                     end_face_index = start_face_index + material.num_faces
-                    for face_index in range(start_face_index, end_face_index):
-                        mesh_data.polygons[face_index].material_index = i
+                    material_indices[start_face_index:end_face_index] = i
+                mesh_data.polygons.foreach_set("material_index", material_indices)
 
         # skeleton
         if len(data.bones) > 0 or len(data.sockets) > 0:
@@ -94,6 +94,7 @@ public partial class BlenderExportOptions : ExportOptionsBase
     [ObservableProperty] private bool scaleDown = true;
     [ObservableProperty] private bool importCollection = true;
     [ObservableProperty] private bool spawnAt3DCursor = false;
+    [ObservableProperty] private bool debug = false;
 
     [ObservableProperty, NotifyPropertyChangedFor(nameof(IsTastyRig))] private ERigType rigType = ERigType.Default;
     public bool IsTastyRig => RigType == ERigType.Tasty;
@@ -111,6 +112,7 @@ public partial class BlenderExportOptions : ExportOptionsBase
     [ObservableProperty] private float cavity = 0.0f;
     [ObservableProperty] private float subsurface = 0.04f;
     [ObservableProperty] private float toonBrightness = 1.0f;
+    [ObservableProperty] private bool importUnusedParameters = true;
 
     [ObservableProperty] private bool importSounds = true;
     [ObservableProperty] private bool loopAnimation = false;